@@ -1 +1,6 @@
-from .json_codec import *
\ No newline at end of file
+from .async_codec import aiter_decode, decode_async
+from .json_codec import *
+from .json_text import encode_to_bytes, encode_to_str, iterencode
+from .lazy import LazyList, LazyRecord, decode_lazy
+from .parallel import BatchValidationError, decode_many
+from .streaming import iter_decode, write_ndjson
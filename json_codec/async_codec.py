@@ -0,0 +1,90 @@
+import asyncio
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from json_codec.json_codec import (
+    DecoderPlan,
+    JsonLoads,
+    LocatedValidationError,
+    _drive_frames,
+    _loads_with_decimals,
+    compile_decoder,
+    json_loads,
+)
+
+T = TypeVar("T")
+
+# frame steps decoded between checks for giving control back to the event loop
+ASYNC_DECODE_BUDGET = 1000
+
+
+async def _decode_cooperatively(
+    plan: DecoderPlan[T],
+    value: Any,
+    budget: int,
+    time_slice: Optional[float],
+) -> T:
+    errors: List[LocatedValidationError] = []
+    steps = _drive_frames(plan, value, None, "$", errors, False, budget)
+    started = perf_counter()
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return plan._unwrap(e.value, errors)
+
+        if time_slice is None or perf_counter() - started >= time_slice:
+            await asyncio.sleep(0)
+            started = perf_counter()
+
+
+async def decode_async(
+    value: Any,
+    type_: Type[T],
+    budget: int = ASYNC_DECODE_BUDGET,
+    time_slice: Optional[float] = None,
+    numeric_arrays: Optional[str] = None,
+) -> T:
+    plan = compile_decoder(type_, numeric_arrays)
+    return await _decode_cooperatively(plan, value, budget, time_slice)
+
+
+async def aiter_decode(
+    stream: AsyncIterable[Union[str, bytes]],
+    type_: Type[T],
+    loads: Optional[JsonLoads] = None,
+    budget: int = ASYNC_DECODE_BUDGET,
+    time_slice: Optional[float] = None,
+    numeric_arrays: Optional[str] = None,
+) -> AsyncIterator[T]:
+    plan = compile_decoder(type_, numeric_arrays)
+    if loads is None:
+        loads = _loads_with_decimals if plan.parses_decimals else json_loads
+
+    # chunks of the unfinished line are joined only once a newline arrives, so
+    # a line spanning many chunks is not copied again for each of them
+    pending: List[bytes] = []
+    async for chunk in stream:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        pending.append(chunk)
+        if b"\n" not in chunk:
+            continue
+        lines = b"".join(pending).split(b"\n")
+        pending = [lines.pop()]
+        for line in lines:
+            if line.strip():
+                yield await _decode_cooperatively(plan, loads(line), budget, time_slice)
+
+    buffer = b"".join(pending)
+    if buffer.strip():
+        yield await _decode_cooperatively(plan, loads(buffer), budget, time_slice)
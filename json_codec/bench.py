@@ -0,0 +1,405 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, make_dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from typing_extensions import Literal
+
+from json_codec.json_codec import compile_decoder, encode
+from json_codec.json_text import encode_to_bytes
+
+# the results of one run are compared against a baseline with this much slack
+DEFAULT_TOLERANCE = 0.10
+
+
+@dataclass
+class FlatRecord:
+    id: int
+    name: str
+    score: float
+    active: bool
+    email: str
+
+
+@dataclass
+class Circle:
+    kind: Literal["circle"]
+    radius: float
+
+
+@dataclass
+class Square:
+    kind: Literal["square"]
+    side: float
+
+
+@dataclass
+class Rectangle:
+    kind: Literal["rectangle"]
+    width: float
+    height: float
+
+
+@dataclass
+class Triangle:
+    kind: Literal["triangle"]
+    a: float
+    b: float
+    c: float
+
+
+@dataclass
+class Label:
+    kind: Literal["label"]
+    text: str
+
+
+@dataclass
+class Point:
+    kind: Literal["point"]
+    x: int
+    y: int
+
+
+Shape = Union[Circle, Square, Rectangle, Triangle, Label, Point, int, str]
+
+
+# without a tag, each object is tried against the members in order
+@dataclass
+class Disc:
+    radius: float
+
+
+@dataclass
+class Tile:
+    side: float
+
+
+@dataclass
+class Frame:
+    width: float
+    height: float
+
+
+@dataclass
+class Wedge:
+    a: float
+    b: float
+    c: float
+
+
+@dataclass
+class Caption:
+    text: str
+
+
+@dataclass
+class Dot:
+    x: int
+    y: int
+
+
+UntaggedShape = Union[Disc, Tile, Frame, Wedge, Caption, Dot]
+
+
+@dataclass
+class Event:
+    at: datetime
+    day: date
+    expires: datetime
+
+
+@dataclass
+class Price:
+    amount: Decimal
+    tax: Decimal
+    currency: str
+
+
+@dataclass
+class Workload:
+    name: str
+    type_: Any
+    value: Any
+    size: int
+
+
+def _flat_records(rng: random.Random, scale: int) -> Workload:
+    value = [
+        {
+            "id": index,
+            "name": "user-{}".format(rng.randrange(10**6)),
+            "score": rng.random() * 100,
+            "active": rng.random() < 0.5,
+            "email": "user{}@example.com".format(index),
+        }
+        for index in range(scale * 20)
+    ]
+    return Workload("flat_records", List[FlatRecord], value, len(value))
+
+
+NESTING_DEPTH = 40
+
+
+def _nested_types(depth: int) -> Any:
+    # one dataclass per level, field types are not resolved from forward
+    # references so a self-referencing node cannot be used
+    node: Any = make_dataclass("Level0", [("value", int)])
+    for level in range(1, depth + 1):
+        node = make_dataclass(
+            "Level{}".format(level), [("value", int), ("child", node)]
+        )
+    return node
+
+
+_DeepNode: Any = _nested_types(NESTING_DEPTH)
+
+
+def _deep_nesting(rng: random.Random, scale: int) -> Workload:
+    def chain() -> Dict[str, Any]:
+        node: Dict[str, Any] = {"value": rng.randrange(1000)}
+        for _ in range(NESTING_DEPTH):
+            node = {"value": rng.randrange(1000), "child": node}
+        return node
+
+    value = [chain() for _ in range(scale // 2 or 1)]
+    return Workload(
+        "deep_nesting", List[_DeepNode], value, len(value) * (NESTING_DEPTH + 1)
+    )
+
+
+def _primitive_lists(rng: random.Random, scale: int) -> Workload:
+    value = [rng.randrange(-(10**9), 10**9) for _ in range(scale * 200)]
+    return Workload("primitive_lists", List[int], value, len(value))
+
+
+def _wide_unions(rng: random.Random, scale: int) -> Workload:
+    makers: Sequence[Callable[[], Any]] = (
+        lambda: {"kind": "circle", "radius": rng.random()},
+        lambda: {"kind": "square", "side": rng.random()},
+        lambda: {"kind": "rectangle", "width": rng.random(), "height": rng.random()},
+        lambda: {
+            "kind": "triangle",
+            "a": rng.random(),
+            "b": rng.random(),
+            "c": rng.random(),
+        },
+        lambda: {"kind": "label", "text": "label-{}".format(rng.randrange(100))},
+        lambda: {"kind": "point", "x": rng.randrange(100), "y": rng.randrange(100)},
+        lambda: rng.randrange(100),
+        lambda: "shape-{}".format(rng.randrange(100)),
+    )
+    value = [rng.choice(makers)() for _ in range(scale * 20)]
+    return Workload("wide_unions", List[Shape], value, len(value))
+
+
+def _untagged_unions(rng: random.Random, scale: int) -> Workload:
+    makers: Sequence[Callable[[], Any]] = (
+        lambda: {"radius": rng.random()},
+        lambda: {"side": rng.random()},
+        lambda: {"width": rng.random(), "height": rng.random()},
+        lambda: {"a": rng.random(), "b": rng.random(), "c": rng.random()},
+        lambda: {"text": "label-{}".format(rng.randrange(100))},
+        lambda: {"x": rng.randrange(100), "y": rng.randrange(100)},
+    )
+    value = [rng.choice(makers)() for _ in range(scale * 20)]
+    return Workload("untagged_unions", List[UntaggedShape], value, len(value))
+
+
+def _datetimes(rng: random.Random, scale: int) -> Workload:
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    value = []
+    for _ in range(scale * 20):
+        at = start + timedelta(seconds=rng.randrange(10**8))
+        value.append(
+            {
+                "at": at.isoformat(),
+                "day": at.date().isoformat(),
+                "expires": (at + timedelta(days=30)).isoformat(),
+            }
+        )
+    return Workload("datetimes", List[Event], value, len(value))
+
+
+def _decimals(rng: random.Random, scale: int) -> Workload:
+    value = [
+        {
+            "amount": "{}.{:02d}".format(rng.randrange(10**6), rng.randrange(100)),
+            "tax": "{}.{:04d}".format(rng.randrange(100), rng.randrange(10**4)),
+            "currency": rng.choice(("EUR", "USD", "BRL")),
+        }
+        for _ in range(scale * 20)
+    ]
+    return Workload("decimals", List[Price], value, len(value))
+
+
+def _big_dicts(rng: random.Random, scale: int) -> Workload:
+    value = {"key-{}".format(index): rng.random() for index in range(scale * 100)}
+    return Workload("big_dicts", Dict[str, float], value, len(value))
+
+
+WORKLOADS: Dict[str, Callable[[random.Random, int], Workload]] = {
+    "flat_records": _flat_records,
+    "deep_nesting": _deep_nesting,
+    "primitive_lists": _primitive_lists,
+    "wide_unions": _wide_unions,
+    "untagged_unions": _untagged_unions,
+    "datetimes": _datetimes,
+    "decimals": _decimals,
+    "big_dicts": _big_dicts,
+}
+
+
+def build_workloads(
+    seed: int = 0, scale: int = 100, names: Optional[Sequence[str]] = None
+) -> List[Workload]:
+    # every workload gets its own generator so selecting a subset does not
+    # change the data of the others
+    return [
+        WORKLOADS[name](random.Random("{}:{}".format(seed, name)), scale)
+        for name in (names or WORKLOADS)
+    ]
+
+
+def _best_time(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(function: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _operations(workload: Workload) -> Dict[str, Callable[[], Any]]:
+    plan = compile_decoder(workload.type_)
+    text = json.dumps(workload.value).encode()
+    decoded = plan.decode(workload.value)
+    return {
+        "decode": lambda: plan.decode(workload.value),
+        "decode_bytes": lambda: plan.decode_json(text),
+        "encode": lambda: encode(decoded),
+        "encode_bytes": lambda: encode_to_bytes(decoded),
+    }
+
+
+def run(workloads: Sequence[Workload], repeat: int = 5) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for workload in workloads:
+        for operation, function in _operations(workload).items():
+            # one untimed call fills the plan and writer caches
+            function()
+            seconds = _best_time(function, repeat)
+            results["{}.{}".format(workload.name, operation)] = {
+                "seconds": seconds,
+                "items_per_second": workload.size / seconds if seconds else None,
+                "peak_bytes": _peak_memory(function),
+            }
+    return results
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    regressions: List[str] = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    "{} {}: {:.6g} -> {:.6g} (+{:.1%})".format(
+                        name,
+                        metric,
+                        previous[metric],
+                        result[metric],
+                        result[metric] / previous[metric] - 1,
+                    )
+                )
+    return regressions
+
+
+def _format_table(results: Dict[str, Any]) -> str:
+    lines = [
+        "{:<32} {:>12} {:>14} {:>12}".format("benchmark", "ms", "items/s", "peak KiB")
+    ]
+    for name, result in results.items():
+        lines.append(
+            "{:<32} {:>12.3f} {:>14.0f} {:>12.1f}".format(
+                name,
+                result["seconds"] * 1000,
+                result["items_per_second"] or 0,
+                result["peak_bytes"] / 1024,
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m json_codec.bench",
+        description="Time decode and encode over synthetic workloads.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--only", action="append", choices=sorted(WORKLOADS), metavar="WORKLOAD"
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a saved results file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    workloads = build_workloads(args.seed, args.scale, args.only)
+    results = run(workloads, args.repeat)
+    print(_format_table(results))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "seed": args.seed,
+                    "scale": args.scale,
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline.get("seed"), baseline.get("scale")) != (args.seed, args.scale):
+            print("warning: baseline was recorded with another seed or scale")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for regression in regressions:
+            print("regression: " + regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
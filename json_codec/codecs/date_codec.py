@@ -1,35 +1,31 @@
-from typing import Any, Generator, Type, TypeVar
-from datetime import date, datetime
+from typing import Any, TypeVar, Union
+from datetime import date
 
+from json_codec.codecs.iso8601 import memoized, parse_date
 from json_codec.types import (
-    ParseProcessResult,
-    ParseProcessYield,
-    TypeDecoder,
+    LeafTypeDecoder,
     ValidationError,
+    ValidationErrorBase,
 )
 
 T = TypeVar("T")
 
 
-class DateTypeDecoder(TypeDecoder[date]):
-    def parse(
-        self, value: Any, *types: Type[Any]
-    ) -> Generator[
-        ParseProcessYield[Any], ParseProcessResult[Any], ParseProcessResult[date]
-    ]:
+class DateTypeDecoder(LeafTypeDecoder[date]):
+    def __init__(self, cache_size: int = 0) -> None:
+        self.parse_date = memoized(parse_date, cache_size)
+
+    def decode(self, value: Any) -> Union[ValidationErrorBase, date]:
         if not isinstance(value, str):
-            return self._failure(ValidationError(f"Expected string, got {value}"))
+            return ValidationError(f"Expected string, got {value}")
 
         try:
-            return self._success(datetime.strptime(value, "%Y-%m-%d").date())
+            return self.parse_date(value)
         except ValueError:
-            return self._failure(
-                ValidationError(
-                    f"Expected date in format YYYY-MM-DD, but {value} is not a valid value"
-                )
+            return ValidationError(
+                f"Expected date in format YYYY-MM-DD, but {value} is not a valid value"
             )
-        yield
 
 
 def serialize_date(value: date) -> Any:
-    return value.strftime("%Y-%m-%d")
+    return value.isoformat()
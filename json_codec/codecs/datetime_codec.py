@@ -1,36 +1,37 @@
-from typing import Any, Generator, Type, TypeVar
+from typing import Any, TypeVar, Union
 from datetime import datetime, timezone
 
+from json_codec.codecs.iso8601 import memoized, parse_datetime
 from json_codec.types import (
-    ParseProcessResult,
-    ParseProcessYield,
-    TypeDecoder,
+    LeafTypeDecoder,
     ValidationError,
+    ValidationErrorBase,
 )
 
 T = TypeVar("T")
 
 
-class DateTimeTypeDecoder(TypeDecoder[datetime]):
-    def parse(
-        self, value: Any, *types: Type[Any]
-    ) -> Generator[
-        ParseProcessYield[Any], ParseProcessResult[Any], ParseProcessResult[datetime]
-    ]:
+class DateTimeTypeDecoder(LeafTypeDecoder[datetime]):
+    def __init__(self, cache_size: int = 0) -> None:
+        # records often repeat the same timestamps, which a cache turns into
+        # a lookup
+        self.parse_datetime = memoized(parse_datetime, cache_size)
+
+    def decode(self, value: Any) -> Union[ValidationErrorBase, datetime]:
         if not isinstance(value, str):
-            return self._failure(ValidationError(f"Expected string, got {value}"))
+            return ValidationError(f"Expected string, got {value}")
 
         try:
             # parse with iso format: 2020-01-01T00:00:00+00:00
-            return self._success(datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z"))
+            return self.parse_datetime(value)
         except ValueError:
-            return self._failure(
-                ValidationError(
-                    f"Expected datetime in iso format, got {value} (expected format: 2020-01-01T00:00:00+00:00)"
-                )
+            return ValidationError(
+                f"Expected datetime in iso format, got {value} (expected format: 2020-01-01T00:00:00+00:00)"
             )
-        yield
 
 
 def serialize_datetime(value: datetime) -> Any:
-    return value.astimezone(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S%z")
+    if value.tzinfo is not timezone.utc:
+        value = value.astimezone(tz=timezone.utc)
+    # same text as strftime("%Y-%m-%dT%H:%M:%S%z") without the format parsing
+    return value.replace(microsecond=0, tzinfo=None).isoformat() + "+0000"
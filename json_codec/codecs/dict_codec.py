@@ -48,12 +48,9 @@ class DictTypeDecoder(TypeDecoder[Dict[K, V]]):
         initial_dict: Dict[K, V] = {}
 
         for key, value in dict_item.items():
-            key_json_path = f"['{key}'] (key)"
+            parsed_key = yield ParseProcessYield(key, key_type, (key, "key"))
 
-            parsed_key = yield ParseProcessYield(key, key_type, key_json_path)
-
-            value_json_path = f"['{key}'] (value)"
-            parsed_value = yield ParseProcessYield(value, value_type, value_json_path)
+            parsed_value = yield ParseProcessYield(value, value_type, (key, "value"))
 
             if not isinstance(parsed_key.result, Exception) and not isinstance(
                 parsed_value.result, Exception
@@ -0,0 +1,75 @@
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# the C fromisoformat parsers take the common shapes; this pattern covers what
+# older interpreters reject there: a "Z" suffix, any number of fraction digits
+# and offsets without a colon
+_DATETIME_PATTERN = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:[.,](\d+))?"
+    r"(?:([Zz])|([+-])(\d{2}):?(\d{2}))$"
+)
+_TIME_PATTERN = re.compile(r"(\d{2}):(\d{2}):(\d{2})(?:[.,](\d+))?$")
+
+
+def _microseconds(fraction: Optional[str]) -> int:
+    if not fraction:
+        return 0
+    return int(fraction[:6].ljust(6, "0"))
+
+
+def parse_datetime(value: str) -> datetime:
+    try:
+        result = datetime.fromisoformat(value)
+    except ValueError:
+        match = _DATETIME_PATTERN.match(value)
+        if match is None:
+            # still accepts the loose values strptime used to take
+            return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+        year, month, day, hour, minute, second, fraction = match.groups()[:7]
+        utc, sign, offset_hours, offset_minutes = match.groups()[7:]
+        tzinfo = timezone.utc
+        if not utc:
+            offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+            tzinfo = timezone(-offset if sign == "-" else offset)
+        return datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour),
+            int(minute),
+            int(second),
+            _microseconds(fraction),
+            tzinfo,
+        )
+    if result.tzinfo is None:
+        raise ValueError(f"Missing UTC offset in {value}")
+    return result
+
+
+def parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def parse_time(value: str) -> time:
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        match = _TIME_PATTERN.match(value)
+        if match is None:
+            return datetime.strptime(value, "%H:%M:%S").time()
+        hour, minute, second, fraction = match.groups()
+        return time(int(hour), int(minute), int(second), _microseconds(fraction))
+
+
+def memoized(parse: Callable[[str], T], cache_size: int) -> Callable[[str], T]:
+    # failures raise and are never cached, so only valid strings take a slot
+    if cache_size <= 0:
+        return parse
+    return lru_cache(maxsize=cache_size)(parse)
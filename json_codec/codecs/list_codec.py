@@ -33,7 +33,7 @@ class ListTypeDecoder(TypeDecoder[List[T]]):
 
         for index, item in enumerate(value):
             parsed_item = yield ParseProcessYield(
-                type_=list_type, value=item, json_path=f"[{index}]"
+                type_=list_type, value=item, json_path=index
             )
             if isinstance(parsed_item.result, Exception):
                 raise parsed_item.result
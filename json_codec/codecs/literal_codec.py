@@ -0,0 +1,37 @@
+from enum import Enum
+from typing import Any, Generator, Type, TypeVar
+
+from json_codec.types import (
+    ParseProcessResult,
+    ParseProcessYield,
+    TypeDecoder,
+    ValidationError,
+)
+
+T = TypeVar("T")
+
+
+def literal_json_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+class LiteralTypeDecoder(TypeDecoder[Any]):
+    def parse(
+        self, value: Any, *values: Any
+    ) -> Generator[
+        ParseProcessYield[Any], ParseProcessResult[Any], ParseProcessResult[Any]
+    ]:
+        for literal in values:
+            json_value = literal_json_value(literal)
+            # 1 == True, so the JSON types must match as well
+            if type(value) is type(json_value) and value == json_value:
+                return self._success(literal)
+
+        return self._failure(
+            ValidationError(
+                "Expected one of {}, got {!r}".format(
+                    ", ".join(repr(literal_json_value(v)) for v in values), value
+                )
+            )
+        )
+        yield
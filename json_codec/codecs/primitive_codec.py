@@ -1,34 +1,26 @@
-from typing import Any, Callable, Generator, Type, TypeVar
+from typing import Any, Callable, TypeVar, Union
 
 from json_codec.types import (
-    ParseProcessResult,
-    ParseProcessYield,
-    TypeDecoder,
+    LeafTypeDecoder,
     ValidationError,
+    ValidationErrorBase,
 )
 
 T = TypeVar("T")
 
 
-class PrimitiveTypeDecoder(TypeDecoder[T]):
+class PrimitiveTypeDecoder(LeafTypeDecoder[T]):
     def __init__(self, type_: Callable[..., T], type_name: str) -> None:
         self.type_ = type_
         self.type_name = type_name
 
-    def parse(
-        self, value: Any, *types: Type[Any]
-    ) -> Generator[
-        ParseProcessYield[Any], ParseProcessResult[Any], ParseProcessResult[T]
-    ]:
+    def decode(self, value: Any) -> Union[ValidationErrorBase, T]:
         try:
-            return self._success(self.type_(value))
+            return self.type_(value)
         except ValueError:
-            return self._failure(
-                ValidationError(
-                    f"Expected type {self.type_name}, but '{value}' is not a valid value"
-                )
+            return ValidationError(
+                f"Expected type {self.type_name}, but '{value}' is not a valid value"
             )
-        yield
 
 
 def serialize_primitive(value: Any) -> Any:
@@ -1,35 +1,31 @@
-from typing import Any, Generator, Type, TypeVar
-from datetime import datetime, time
+from typing import Any, TypeVar, Union
+from datetime import time
 
+from json_codec.codecs.iso8601 import memoized, parse_time
 from json_codec.types import (
-    ParseProcessResult,
-    ParseProcessYield,
-    TypeDecoder,
+    LeafTypeDecoder,
     ValidationError,
+    ValidationErrorBase,
 )
 
 T = TypeVar("T")
 
 
-class TimeTypeDecoder(TypeDecoder[time]):
-    def parse(
-        self, value: Any, *types: Type[Any]
-    ) -> Generator[
-        ParseProcessYield[Any], ParseProcessResult[Any], ParseProcessResult[time]
-    ]:
+class TimeTypeDecoder(LeafTypeDecoder[time]):
+    def __init__(self, cache_size: int = 0) -> None:
+        self.parse_time = memoized(parse_time, cache_size)
+
+    def decode(self, value: Any) -> Union[ValidationErrorBase, time]:
         if not isinstance(value, str):
-            return self._failure(ValidationError(f"Expected string, got {value}"))
+            return ValidationError(f"Expected string, got {value}")
 
         try:
-            return self._success(datetime.strptime(value, "%H:%M:%S").time())
+            return self.parse_time(value)
         except ValueError:
-            return self._failure(
-                ValidationError(
-                    f"Expected date in format YYYY-MM-DD, but {value} is not a valid value"
-                )
+            return ValidationError(
+                f"Expected time in format HH:MM:SS, but {value} is not a valid value"
             )
-        yield
 
 
 def serialize_time(value: time) -> Any:
-    return value.strftime("%H:%M:%S")
+    return "%02d:%02d:%02d" % (value.hour, value.minute, value.second)
@@ -1,4 +1,5 @@
-from typing import Any, Generator, Tuple, Type, TypeVar
+from itertools import repeat
+from typing import Any, Generator, Iterable, List, Tuple, Type, TypeVar
 
 from json_codec.types import (
     ParseProcessResult,
@@ -21,14 +22,25 @@ class TupleTypeDecoder(TypeDecoder[Tuple[T, ...]]):
         if not isinstance(value, list):
             return self._failure(ValidationError(f"Expected list, got {value}"))
 
-        final_tuple: Tuple[T, ...] = ()
-
-        # TODO: make sure tuple will match the types
-        for i, (item_type, item) in enumerate(zip(types, value)):
-            parsed_item = yield ParseProcessYield(item_type, item, json_path=f"[{i}]")
+        item_types: Iterable[Type[Any]]
+        if len(types) == 2 and types[1] is Ellipsis:
+            # Tuple[T, ...] takes any number of items
+            item_types = repeat(types[0])
+        elif len(value) != len(types):
+            return self._failure(
+                ValidationError(f"Expected {len(types)} items, got {len(value)}")
+            )
+        else:
+            item_types = types
+
+        items: List[T] = []
+        for i, (item_type, item) in enumerate(zip(item_types, value)):
+            parsed_item = yield ParseProcessYield(
+                type_=item_type, value=item, json_path=i
+            )
 
             if isinstance(parsed_item.result, Exception):
                 raise parsed_item.result
 
-            final_tuple += (parsed_item.result,)
-        return self._success(final_tuple)
+            items.append(parsed_item.result)
+        return self._success(tuple(items))
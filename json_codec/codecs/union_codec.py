@@ -1,16 +1,143 @@
-from typing import Any, Generator, Type, TypeVar
+from dataclasses import MISSING, is_dataclass
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from typing_extensions import Literal
 
+from json_codec.codecs.literal_codec import literal_json_value
 from json_codec.types import (
+    AssumeDataclass,
+    AssumeGeneric,
     ParseProcessResult,
     ParseProcessYield,
     TypeDecoder,
     ValidationError,
 )
+from json_codec.utils import is_generic
 
 T = TypeVar("T")
 
+_JSON_TYPES = (dict, list, str, int, float, bool, type(None))
+
+
+def _json_types_accepted(type_: Any) -> Optional[Tuple[type, ...]]:
+    # the JSON types a member can possibly decode, None when it may take any
+    while hasattr(type_, "__supertype__"):
+        type_ = type_.__supertype__
+    if type_ is type(None):
+        return (type(None),)
+    if is_dataclass(type_):
+        return (dict,)
+    if is_generic(type_):
+        origin: Any = cast(AssumeGeneric, type_).__origin__
+        if origin in (list, set, tuple):
+            return (list,)
+        if origin is dict:
+            return (dict,)
+        if origin is Literal:
+            return tuple(
+                type(literal_json_value(v)) for v in cast(AssumeGeneric, type_).__args__
+            )
+    return None
+
+
+def _literal_fields(type_: Any) -> Dict[str, Tuple[Any, ...]]:
+    literal_fields: Dict[str, Tuple[Any, ...]] = {}
+    for name, field in cast(AssumeDataclass, type_).__dataclass_fields__.items():
+        field_type: Any = field.type
+        if is_generic(field_type) and field_type.__origin__ is Literal:
+            literal_fields[name] = field_type.__args__
+    return literal_fields
+
+
+def _has_default(type_: Any, name: str) -> bool:
+    field = cast(AssumeDataclass, type_).__dataclass_fields__[name]
+    return field.default is not MISSING or field.default_factory is not MISSING
+
+
+class _UnionDispatch:
+    def __init__(self, types: Tuple[Any, ...]) -> None:
+        # a Literal field whose values are distinct across the dataclass members
+        # selects the member from the tag without trying the others
+        self.tag_field: Optional[str] = None
+        self.tags: Dict[Any, Any] = {}
+        member_fields = [
+            (type_, _literal_fields(type_)) for type_ in types if is_dataclass(type_)
+        ]
+        for _, literal_fields in member_fields:
+            for name in literal_fields:
+                tags: Dict[Any, List[Any]] = {}
+                for member, fields in member_fields:
+                    for literal in fields.get(name, ()):
+                        tags.setdefault(literal_json_value(literal), []).append(member)
+                if all(len(tagged) == 1 for tagged in tags.values()):
+                    self.tag_field = name
+                    self.tags = {tag: tagged[0] for tag, tagged in tags.items()}
+                    break
+            if self.tag_field is not None:
+                break
+
+        # members left to try for each JSON type, in declaration order
+        tagged_members = set(self.tags.values())
+        accepted = [
+            (type_, _json_types_accepted(type_))
+            for type_ in types
+            if type_ not in tagged_members
+        ]
+        self.candidates: Dict[type, Tuple[Any, ...]] = {
+            json_type: tuple(
+                type_
+                for type_, json_types in accepted
+                if json_types is None or json_type in json_types
+            )
+            for json_type in _JSON_TYPES
+        }
+        # objects without the tag field may still be tagged members whose tag
+        # has a default
+        tag_field = self.tag_field
+        self.untagged: Tuple[Any, ...] = tuple(
+            type_
+            for type_ in types
+            if type_ in self.candidates[dict]
+            or (
+                tag_field is not None
+                and type_ in tagged_members
+                and _has_default(type_, tag_field)
+            )
+        )
+        self.field_names: Dict[Any, FrozenSet[str]] = {
+            type_: frozenset(cast(AssumeDataclass, type_).__dataclass_fields__)
+            for type_ in types
+            if is_dataclass(type_)
+        }
+
+    def closest(self, value: Any, tried: Tuple[Any, ...]) -> Optional[Any]:
+        # the record member an object that matched no member was most likely
+        # meant to be, the one sharing the most fields with it
+        if type(value) is not dict:
+            return None
+        records = [type_ for type_ in tried if type_ in self.field_names]
+        if not records:
+            return None
+        return max(
+            records, key=lambda type_: len(self.field_names[type_] & value.keys())
+        )
+
 
 class UnionTypeDecoder(TypeDecoder[Any]):
+    def __init__(self) -> None:
+        self._dispatch: Dict[Tuple[Any, ...], _UnionDispatch] = {}
+
     def parse(
         self, value: Any, *types: Type[Any]
     ) -> Generator[
@@ -23,13 +150,52 @@ class UnionTypeDecoder(TypeDecoder[Any]):
                 json_path="",
             )
             return result
-        for type_ in types:
+
+        dispatch = self._dispatch.get(types)
+        if dispatch is None:
+            dispatch = self._dispatch[types] = _UnionDispatch(types)
+
+        candidates = dispatch.candidates.get(type(value), types)
+        tag_field = dispatch.tag_field
+        if tag_field is not None and type(value) is dict:
+            if tag_field not in value:
+                candidates = dispatch.untagged
+            else:
+                try:
+                    member = dispatch.tags.get(value[tag_field])
+                except TypeError:
+                    # unhashable tags select nothing
+                    member = None
+                if member is not None:
+                    result = yield ParseProcessYield(
+                        type_=member,
+                        value=value,
+                        json_path="",
+                    )
+                    return result
+
+        for type_ in candidates:
             parse_result = yield ParseProcessYield(
                 type_=type_, value=value, json_path="", skip_raise=True
             )
             if not isinstance(parse_result.result, Exception):
                 return parse_result
 
+        if tag_field is not None and type(value) is dict and tag_field in value:
+            return self._failure(
+                ValidationError(
+                    f"Field '{tag_field}' does not match any of the union types"
+                )
+            )
+        closest = dispatch.closest(value, candidates)
+        if closest is not None:
+            # decoded again to report where it went wrong
+            result = yield ParseProcessYield(
+                type_=closest,
+                value=value,
+                json_path="",
+            )
+            return result
         return self._failure(
             ValidationError(f"Value {value} does not match any of the union types")
         )
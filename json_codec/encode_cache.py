@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+ENCODE_CACHE_SIZE = 4096
+
+
+class EncodeCache:
+    def __init__(self, max_size: int = ENCODE_CACHE_SIZE) -> None:
+        # least recently used entries are evicted first once max_size is reached
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # entries keep the object they were encoded from, so the id in their
+        # key cannot be taken by another object while they are cached
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Hashable, encode: Callable[[Any], Any], value: Any) -> Any:
+        # keys are built from id(value): equal records can hold values that
+        # encode differently, such as 1 and 1.0
+        entries = self._entries
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None and entry[0] is value:
+                entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        # encoded outside the lock, nested values look their own entries up
+        encoded = encode(value)
+        try:
+            hash(value)
+        except TypeError:
+            # frozen records holding lists or dicts can still change
+            return encoded
+        with self._lock:
+            self.misses += 1
+            entries[key] = (value, encoded)
+            if len(entries) > self.max_size:
+                entries.popitem(last=False)
+        return encoded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,143 @@
+import heapq
+import threading
+from dataclasses import dataclass, replace
+from itertools import count
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# called after every instrumented decode step with the type, the seconds spent
+# (children included) and whether the step itself failed
+DecodeHook = Callable[[Any, float, bool], None]
+
+
+@dataclass
+class TypeStats:
+    calls: int = 0
+    errors: int = 0
+    # total_time includes nested values, own_time leaves them out
+    total_time: float = 0.0
+    own_time: float = 0.0
+
+
+class SlowPath(NamedTuple):
+    own_time: float
+    total_time: float
+    json_path: str
+    type_: Any
+
+
+@dataclass
+class StatsSnapshot:
+    types: Dict[Any, TypeStats]
+    slowest: List[SlowPath]
+
+
+class DecodeStats:
+    def __init__(self, slowest: int = 10, hook: Optional[DecodeHook] = None) -> None:
+        self.slowest = slowest
+        self.hook = hook
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._order = count()
+        self.types: Dict[Any, TypeStats] = {}
+        self._slowest: List[Tuple[float, int, SlowPath]] = []
+
+    def snapshot(self) -> StatsSnapshot:
+        with self._lock:
+            types = {type_: replace(stats) for type_, stats in self.types.items()}
+            slowest = sorted(
+                (entry[2] for entry in self._slowest),
+                key=lambda path: path.own_time,
+                reverse=True,
+            )
+        return StatsSnapshot(types, slowest)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.types = {}
+            self._slowest = []
+
+    def instrument(
+        self,
+        type_: Any,
+        parse: Callable[..., Any],
+        render_path: Callable[[Any, Any], str],
+    ) -> Callable[..., Any]:
+        local = self._local
+
+        def timed_parse(
+            value: Any,
+            parent: Any,
+            segment: Any,
+            located_errors: List[Any],
+            skip_raise: bool,
+        ) -> Any:
+            # each step keeps [time, errors] of its children, so the parent
+            # can tell its own share apart
+            stack: Optional[List[List[Any]]] = getattr(local, "stack", None)
+            if stack is None:
+                stack = local.stack = []
+            children: List[Any] = [0.0, 0]
+            stack.append(children)
+            errors_before = len(located_errors)
+            start = perf_counter()
+            try:
+                result = parse(value, parent, segment, located_errors, skip_raise)
+            finally:
+                elapsed = perf_counter() - start
+                stack.pop()
+            new_errors = len(located_errors) - errors_before
+            if stack:
+                stack[-1][0] += elapsed
+                stack[-1][1] += new_errors
+
+            own_errors = max(new_errors - children[1], 0)
+            if not own_errors and isinstance(result.result, Exception):
+                own_errors = 1
+            self.record(
+                type_,
+                elapsed,
+                elapsed - children[0],
+                own_errors,
+                parent,
+                segment,
+                render_path,
+            )
+            return result
+
+        return timed_parse
+
+    def record(
+        self,
+        type_: Any,
+        total_time: float,
+        own_time: float,
+        errors: int,
+        parent: Any,
+        segment: Any,
+        render_path: Callable[[Any, Any], str],
+    ) -> None:
+        with self._lock:
+            stats = self.types.get(type_)
+            if stats is None:
+                stats = self.types[type_] = TypeStats()
+            stats.calls += 1
+            stats.errors += errors
+            stats.total_time += total_time
+            stats.own_time += own_time
+
+            slowest = self._slowest
+            if len(slowest) < self.slowest or (slowest and own_time > slowest[0][0]):
+                # paths are only rendered for the steps that make the list
+                entry = (
+                    own_time,
+                    next(self._order),
+                    SlowPath(own_time, total_time, render_path(parent, segment), type_),
+                )
+                if len(slowest) < self.slowest:
+                    heapq.heappush(slowest, entry)
+                else:
+                    heapq.heapreplace(slowest, entry)
+
+        if self.hook is not None:
+            self.hook(type_, total_time, errors > 0)
@@ -0,0 +1,82 @@
+from contextvars import ContextVar
+from dataclasses import fields
+from datetime import datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+# entries kept per table, once full values are still looked up but not added
+INTERN_TABLE_SIZE = 64 * 1024
+
+
+# field names of the dataclasses seen by _value_key
+_field_names: Dict[Any, Tuple[str, ...]] = {}
+
+
+def _value_key(value: Any) -> Any:
+    # values that compare equal can still hold different data, such as True
+    # and 1, -0.0 and 0.0 or Decimal("1.0") and Decimal("1.00"), so the key
+    # spells out the exact type of every value inside the record
+    cls = type(value)
+    if cls is float:
+        return cls, value.hex()
+    if cls is Decimal:
+        return cls, value.as_tuple()
+    if isinstance(value, tuple):
+        return cls, tuple(map(_value_key, value))
+    if hasattr(cls, "__dataclass_fields__"):
+        names = _field_names.get(cls)
+        if names is None:
+            names = _field_names[cls] = tuple(field.name for field in fields(cls))
+        return cls, tuple(_value_key(getattr(value, name)) for name in names)
+    if isinstance(value, (datetime, time)):
+        # equal instants in other offsets compare equal
+        return cls, value, value.utcoffset()
+    return cls, value
+
+
+class Interner:
+    def __init__(self, max_size: Optional[int] = INTERN_TABLE_SIZE) -> None:
+        # one instance can be shared by several decode calls to deduplicate
+        # across a batch, the tables live as long as it does
+        self.max_size = max_size
+        self.strings: Dict[str, str] = {}
+        self.records: Dict[Any, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def string(self, value: str) -> str:
+        strings = self.strings
+        interned = strings.get(value)
+        if interned is not None:
+            self.hits += 1
+            return interned
+        self.misses += 1
+        if self.max_size is None or len(strings) < self.max_size:
+            strings[value] = value
+        return value
+
+    def record(self, value: Any) -> Any:
+        records = self.records
+        try:
+            key = _value_key(value)
+            interned = records.get(key)
+        except TypeError:
+            # frozen records holding lists or dicts are not hashable
+            return value
+        if interned is not None:
+            self.hits += 1
+            return interned
+        self.misses += 1
+        if self.max_size is None or len(records) < self.max_size:
+            records[key] = value
+        return value
+
+    def clear(self) -> None:
+        self.strings = {}
+        self.records = {}
+        self.hits = 0
+        self.misses = 0
+
+
+# the interner of the decode call running in this thread or task
+current_interner: ContextVar[Interner] = ContextVar("current_interner")
@@ -1,22 +1,36 @@
 import base64
-from dataclasses import MISSING, asdict, dataclass, is_dataclass
+import json
+from array import array
+from dataclasses import MISSING, dataclass, fields, is_dataclass
 from datetime import date, datetime, time
 from decimal import Decimal
 from enum import Enum
+from functools import lru_cache
+from inspect import getattr_static
+from operator import attrgetter
+from types import ModuleType
+from time import perf_counter
 from typing import (
     Any,
     Callable,
     Dict,
+    Generator,
+    Generic,
+    Iterable,
     List,
     Optional,
+    Set,
     Tuple,
     Type,
     TypeVar,
     Union,
     cast,
+    get_type_hints,
 )
 from uuid import UUID
 
+from typing_extensions import Literal, is_typeddict
+
 from json_codec.codecs.date_codec import (
     DateTypeDecoder,
     serialize_date,
@@ -29,6 +43,7 @@ from json_codec.codecs.dict_codec import DictTypeDecoder
 from json_codec.codecs.list_codec import (
     ListTypeDecoder as ListTypeParser,
 )
+from json_codec.codecs.literal_codec import LiteralTypeDecoder
 from json_codec.codecs.primitive_codec import PrimitiveTypeDecoder
 from json_codec.codecs.set_codec import (
     SetTypeDecoder as SetTypeParser,
@@ -43,18 +58,46 @@ from json_codec.codecs.tuple_codec import (
 from json_codec.codecs.union_codec import (
     UnionTypeDecoder as UnionTypeParser,
 )
+from json_codec.encode_cache import EncodeCache
+from json_codec.instrumentation import DecodeStats
+from json_codec.interning import Interner, current_interner
+from json_codec.projection import SKIPPED, Projection
 from json_codec.types import (
     AssumeDataclass,
     AssumeGeneric,
     AssumeNewType,
+    InvalidEnumValue,
+    JsonPathSegment,
+    LeafTypeDecoder,
     ParseProcessResult,
     TypeDecoder,
     ValidationError,
+    ValidationErrorBase,
+    format_json_path_segment,
 )
-from json_codec.utils import is_generic
+from json_codec.utils import get_class_or_type_name, is_generic
+
+numpy: Optional[ModuleType]
+try:
+    import numpy  # type: ignore[import,no-redef]
+except ImportError:  # pragma: no cover
+    numpy = None
+
+orjson: Optional[ModuleType]
+try:
+    import orjson  # type: ignore[import,no-redef]
+except ImportError:  # pragma: no cover
+    orjson = None
 
 T = TypeVar("T")
 
+DECODER_CACHE_SIZE = 1024
+
+# item types of lists, sets and homogeneous tuples converted in a single pass
+BATCH_PRIMITIVE_TYPES = (int, float, str, bool)
+
+NUMERIC_ARRAY_TYPECODES: Dict[Any, str] = {int: "q", float: "d"}
+
 typers_parsers: Dict[Any, TypeDecoder[Any]] = {
     Decimal: PrimitiveTypeDecoder(Decimal, "Decimal"),
     str: PrimitiveTypeDecoder(str, "string"),
@@ -73,8 +116,32 @@ typers_parsers: Dict[Any, TypeDecoder[Any]] = {
     time: TimeTypeParser(),
     type(None): PrimitiveTypeDecoder(lambda x: None, "null"),
     bytes: PrimitiveTypeDecoder(base64.b64decode, "bytes"),
+    Literal: LiteralTypeDecoder(),
 }
 
+_BUILTIN_PARSERS = dict(typers_parsers)
+
+
+JsonLoads = Callable[[Union[str, bytes]], Any]
+
+json_loads: JsonLoads = orjson.loads if orjson is not None else json.loads
+
+
+def _loads_with_decimals(data: Union[str, bytes]) -> Any:
+    return json.loads(data, parse_float=Decimal)
+
+
+JsonDumps = Callable[[Any], bytes]
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+# orjson is not used to write, it rejects int dict keys and integers wider than
+# 64 bits and writes NaN as null, where encode_to_str writes all of them
+json_dumps: JsonDumps = _stdlib_dumps
+
 
 @dataclass
 class LocatedValidationError:
@@ -90,15 +157,20 @@ class LocatedValidationErrorCollection(Exception):
     def __str__(self) -> str:
         return "\n".join(["{}: {}".format(e.json_path, str(e)) for e in self.errors])
 
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.errors,)
+
 
-def __get_recursive_mapped_type(cls_type: Type[Any]) -> Type[Any]:
+def _get_recursive_mapped_type(
+    cls_type: Type[Any], parsers: Dict[Any, TypeDecoder[Any]]
+) -> Type[Any]:
     if not hasattr(cls_type, "__bases__") or len(cls_type.__bases__) == 0:
         return cls_type
 
-    while cls_type not in typers_parsers:
+    while cls_type not in parsers:
         cls_type = cls_type.__bases__[0]
-        if cls_type not in typers_parsers:
-            return __get_recursive_mapped_type(cls_type)
+        if cls_type not in parsers:
+            return _get_recursive_mapped_type(cls_type, parsers)
     return cls_type
 
 
@@ -114,199 +186,1389 @@ def is_typing_unmappable(type_: Type[Any]) -> bool:
     return type_ is Any or type_ is type(None)
 
 
-def __parse_value(
-    value: Any,
-    type_: Type[T],
-    json_path: str = "$",
-    located_errors: List[LocatedValidationError] = [],
-    skip_raise: bool = False,
-) -> ParseProcessResult[T]:
-    real_type = type_
-    target_type = type_
-    type_args: Tuple[Type[Any], ...] = ()
-    if is_typing_unmappable(type_):
-        ...
-    elif is_generic(type_):
-        real_type = cast(AssumeGeneric, type_).__origin__
-        target_type = real_type
-        type_args = cast(AssumeGeneric, type_).__args__
-    elif is_new_type(type_):
-        target_type = get_new_type_supertype(type_)
-    elif not is_dataclass(type_) and not issubclass(real_type, Enum):
-        target_type = __get_recursive_mapped_type(type_)
-
-    if target_type in typers_parsers:
-        parser = typers_parsers[target_type]
-        parser_generator = parser.parse(value, *type_args)
-        try:
-            parsed_yield = parser_generator.send(cast(Any, None))
-            while True:
-                parsed_value = __parse_value(
-                    parsed_yield.value,
-                    parsed_yield.type_,
-                    "{}{}".format(json_path, parsed_yield.json_path),
-                    located_errors,
-                    parsed_yield.skip_raise,
+def _is_homogeneous_tuple(type_args: Tuple[Any, ...]) -> bool:
+    if len(type_args) == 2 and type_args[1] is Ellipsis:
+        return True
+    return len(type_args) > 0 and all(arg is type_args[0] for arg in type_args)
+
+
+def is_named_tuple(type_: Any) -> bool:
+    return (
+        isinstance(type_, type)
+        and issubclass(type_, tuple)
+        and hasattr(type_, "_fields")
+    )
+
+
+def is_record(type_: Any) -> bool:
+    # types decoded from JSON objects field by field
+    return is_dataclass(type_) or is_named_tuple(type_) or is_typeddict(type_)
+
+
+def _record_fields(cls: Any) -> List[Tuple[str, Any, Any]]:
+    # (name, type, default) for each field, where the default is MISSING for
+    # required fields and _OMITTED for keys a TypedDict may leave out
+    if is_dataclass(cls):
+        record_fields: List[Tuple[str, Any, Any]] = []
+        dataclass_fields = cast(AssumeDataclass, cls).__dataclass_fields__
+        for field_name, field in dataclass_fields.items():
+            default: Any = MISSING
+            if field.default is not None and field.default is not MISSING:
+                default = field.default
+            elif field.default_factory is not None and field.default_factory is not MISSING:  # type: ignore
+                default = _DefaultFactory(field.default_factory)  # type: ignore
+            record_fields.append((field_name, field.type, default))
+        return record_fields
+
+    try:
+        hints = get_type_hints(cls)
+    except (NameError, TypeError):
+        hints = dict(getattr(cls, "__annotations__", {}))
+    if is_named_tuple(cls):
+        defaults = cls._field_defaults
+        return [
+            (name, hints.get(name, Any), defaults.get(name, MISSING))
+            for name in cls._fields
+        ]
+    required = getattr(cls, "__required_keys__", hints if cls.__total__ else ())
+    return [
+        (name, field_type, MISSING if name in required else _OMITTED)
+        for name, field_type in hints.items()
+    ]
+
+
+class DecoderPlan(Generic[T]):
+    def __init__(
+        self,
+        type_: Type[T],
+        numeric_arrays: Optional[str] = None,
+        codec: "Optional[Codec]" = None,
+        projection: Optional[Projection] = None,
+        interning: bool = False,
+    ) -> None:
+        if codec is None:
+            codec = default_codec
+        real_type: Type[Any] = type_
+        target_type: Type[Any] = type_
+        type_args: Tuple[Type[Any], ...] = ()
+        if is_typing_unmappable(type_):
+            ...
+        elif is_generic(type_):
+            real_type = cast(AssumeGeneric, type_).__origin__
+            target_type = real_type
+            type_args = cast(AssumeGeneric, type_).__args__
+        elif is_new_type(type_):
+            target_type = get_new_type_supertype(type_)
+        elif not is_record(type_) and not issubclass(real_type, Enum):
+            target_type = _get_recursive_mapped_type(type_, codec.typers_parsers)
+
+        if numeric_arrays not in (None, "array", "numpy"):
+            raise ValueError(f"Unsupported numeric arrays mode: {numeric_arrays}")
+        if numeric_arrays == "numpy" and numpy is None:
+            raise ImportError("numeric_arrays='numpy' requires numpy to be installed")
+
+        self.type_ = type_
+        self.codec = codec
+        self.numeric_arrays = numeric_arrays
+        self.projection = projection
+        self.interning = interning
+        self.real_type = real_type
+        self.target_type = target_type
+        # Ellipsis and Literal values are type arguments too
+        self.type_args: Tuple[Any, ...] = type_args
+        self.convert: Optional[Callable[[Any], Any]] = (
+            real_type if target_type != real_type else None
+        )
+        self.parser: Optional[TypeDecoder[Any]] = codec.typers_parsers.get(target_type)
+        # set when records and containers may decode the value inline
+        self.leaf: Optional[Callable[[Any], Any]] = None
+        self._decode_leaf: Callable[[Any], Any]
+        # union members see the projection itself, container items its "[*]"
+        self.child_projection: Optional[Projection] = None
+        # record members of a union only see the names they declare
+        self.member_projections: Dict[Any, Projection] = {}
+        if projection is not None:
+            if isinstance(self.parser, UnionTypeParser):
+                self.child_projection = projection
+                self.member_projections = _member_projections(
+                    type_, type_args, projection
                 )
-                parsed_yield = parser_generator.send(parsed_value)
-        except StopIteration as e:
-            final = e.value
-            if not isinstance(final, ParseProcessResult):
-                raise ValueError(f"Parser {parser} did not return a ParseProcessResult")
-            if isinstance(final.result, Exception) and not skip_raise:
+            else:
+                self.child_projection = projection.items()
+        self.enum_members: Optional[Dict[Any, Any]] = None
+        self.enum_lookup: Optional[Callable[[Any], Any]] = None
+        self.fields: Optional[List[Tuple[str, DecoderPlan[Any], Any, str]]] = None
+        self.construct: Optional[Callable[[Dict[str, Any]], Any]] = None
+        # fields left out by a projection, filled in before the decoded ones
+        self.kwargs_template: Optional[Dict[str, Any]] = None
+        self.skipped_factories: List[Tuple[str, Callable[[], Any]]] = []
+        # named tuples are encoded as arrays and decoded from arrays or objects
+        self.positional_fields: Optional[Tuple[str, ...]] = (
+            real_type._fields if is_named_tuple(real_type) else None
+        )
+        self.children: Dict[int, Tuple[Type[Any], DecoderPlan[Any]]] = {}
+        self._parses_decimals: Optional[bool] = None
+        # plans with children are driven by the engine through a frame
+        self.frame: Optional[Callable[..., _Frame]] = None
+
+        self.parse: Callable[
+            [
+                Any,
+                Optional[_Frame],
+                JsonPathSegment,
+                List[LocatedValidationError],
+                bool,
+            ],
+            ParseProcessResult[T],
+        ]
+        if isinstance(self.parser, LeafTypeDecoder):
+            self.leaf = self._decode_leaf = self.parser.decode
+            self.parse = self._parse_leaf
+        elif (
+            (
+                (target_type in (list, set) and len(type_args) == 1)
+                or (target_type is tuple and _is_homogeneous_tuple(type_args))
+            )
+            and type_args[0] in BATCH_PRIMITIVE_TYPES
+            # a custom decoder registered for the item type opts out of batching
+            and codec.typers_parsers.get(type_args[0]) is _BUILTIN_PARSERS[type_args[0]]
+            and not (interning and type_args[0] is str)
+        ):
+            self.parse = self._parse_primitive_batch
+        elif self.parser is not None:
+            self.frame = _DecoderFrame
+            self.parse = self._parse_with_frames
+        elif is_record(real_type):
+            self.frame = _DataclassFrame
+            self.parse = self._parse_with_frames
+        elif issubclass(real_type, Enum):
+            self.enum_members, self.enum_lookup = _compile_enum_lookup(real_type)
+            self.parse = self._parse_enum
+        else:
+            raise ValueError(f"Unsupported type: {type_}")
+
+        if interning and target_type is str and self.leaf is not None:
+            self.leaf = self._decode_leaf = _interning_leaf(self._decode_leaf)
+
+        self.stats = codec.stats
+        if self.stats is not None:
+            # the engine times frames step by step and decodes their children
+            # itself, plans without a frame are timed around their parse call
+            self.leaf = None
+            if self.frame is None:
+                self.parse = self.stats.instrument(type_, self.parse, _render_json_path)
+
+    def decode(self, value: Any, interner: Optional[Interner] = None) -> T:
+        if self.interning:
+            return self._decode_interned(value, interner)
+        errors: List[LocatedValidationError] = []
+        parsed_value = self.parse(value, None, "$", errors, False)
+        return self._unwrap(parsed_value, errors)
+
+    def _decode_interned(self, value: Any, interner: Optional[Interner]) -> T:
+        # without a shared interner, values are only deduplicated within the call
+        token = current_interner.set(Interner() if interner is None else interner)
+        try:
+            errors: List[LocatedValidationError] = []
+            parsed_value = self.parse(value, None, "$", errors, False)
+            return self._unwrap(parsed_value, errors)
+        finally:
+            current_interner.reset(token)
+
+    def _unwrap(
+        self,
+        parsed_value: ParseProcessResult[T],
+        errors: List[LocatedValidationError],
+    ) -> T:
+        if len(errors):
+            raise LocatedValidationErrorCollection(errors)
+
+        if isinstance(parsed_value.result, Exception):
+            raise parsed_value.result
+
+        return parsed_value.result
+
+    def decode_json(
+        self,
+        data: Union[str, bytes],
+        loads: Optional[JsonLoads] = None,
+        interner: Optional[Interner] = None,
+    ) -> T:
+        if loads is None:
+            # stdlib json can hand Decimal fields their exact literal
+            loads = _loads_with_decimals if self.parses_decimals else json_loads
+        return self.decode(loads(data), interner)
+
+    @property
+    def parses_decimals(self) -> bool:
+        if self._parses_decimals is None:
+            # numbers are parsed into Decimal only when no position in the
+            # type would decode one differently from the float json.loads gives
+            self._parses_decimals = _type_tree_contains(
+                self.type_, _is_decimal
+            ) and not _type_tree_contains(self.type_, _tells_floats_apart)
+        return self._parses_decimals
+
+    def _parse_leaf(
+        self,
+        value: Any,
+        parent: "Optional[_Frame]",
+        segment: JsonPathSegment,
+        located_errors: List[LocatedValidationError],
+        skip_raise: bool,
+    ) -> ParseProcessResult[T]:
+        result = self._decode_leaf(value)
+        if isinstance(result, ValidationErrorBase):
+            if not skip_raise:
                 located_errors.append(
                     LocatedValidationError(
-                        message=str(final.result),
-                        json_path=json_path,
+                        message=str(result),
+                        json_path=_render_json_path(parent, segment),
                     )
                 )
+            if self.convert is not None:
+                # like frames, a converted value that failed is reported as None
+                failed: ParseProcessResult[Any] = ParseProcessResult(result=None)
+                return failed
+            return ParseProcessResult(result=result)
 
-            if target_type != real_type:
-                if not isinstance(final.result, Exception):
-                    final = ParseProcessResult(
-                        result=cast(Type[Any], real_type)(final.result),
-                    )
-                else:
-                    final = ParseProcessResult(
-                        result=None,
-                    )
+        if self.convert is not None:
+            result = self.convert(result)
+        return ParseProcessResult(result=result)
+
+    def _parse_with_frames(
+        self,
+        value: Any,
+        parent: "Optional[_Frame]",
+        segment: JsonPathSegment,
+        located_errors: List[LocatedValidationError],
+        skip_raise: bool,
+    ) -> ParseProcessResult[T]:
+        return _parse_value(self, value, parent, segment, located_errors, skip_raise)
 
-            return cast(ParseProcessResult[T], final)
+    def _parse_primitive_batch(
+        self,
+        value: Any,
+        parent: "Optional[_Frame]",
+        segment: JsonPathSegment,
+        located_errors: List[LocatedValidationError],
+        skip_raise: bool,
+    ) -> ParseProcessResult[T]:
+        if type(value) is list and (
+            # fixed shape tuples leave length mismatches to the tuple decoder
+            self.target_type is not tuple
+            or self.type_args[-1] is Ellipsis
+            or len(value) == len(self.type_args)
+        ):
+            item_type = self.type_args[0]
+            try:
+                items = list(map(item_type, value))
+            except (ValueError, TypeError):
+                # decode item by item to locate the invalid values
+                pass
+            else:
+                if self.target_type is set:
+                    return ParseProcessResult(cast(T, set(items)))
+                if self.target_type is tuple:
+                    return ParseProcessResult(cast(T, tuple(items)))
+                return ParseProcessResult(self._to_numeric_array(items))
+
+        # items are leaves, so the frame completes without requesting children
+        frame = _DecoderFrame(self, value, parent, segment, skip_raise)
+        frame.send(None, located_errors)
+        return frame.result
 
-    elif is_dataclass(real_type):
+    def _to_numeric_array(self, items: List[Any]) -> Any:
+        typecode = NUMERIC_ARRAY_TYPECODES.get(self.type_args[0])
+        if self.numeric_arrays is None or typecode is None:
+            return items
         try:
-            return ParseProcessResult(
-                __parse_dataclass(
-                    value,
-                    real_type,
-                    json_path,
-                    located_errors,
+            if self.numeric_arrays == "numpy" and numpy is not None:
+                return numpy.array(items, dtype=typecode)
+            return array(typecode, items)
+        except OverflowError:
+            # integers beyond 64 bits stay in a plain list
+            return items
+
+    def _compile_record(self) -> List[Tuple[str, "DecoderPlan[Any]", Any, str]]:
+        # the constructor goes first, frames only check the fields
+        self.construct = _compile_constructor(self.real_type)
+        if self.interning and _is_hashable_record(self.real_type):
+            self.construct = _interning_constructor(self.construct)
+        self.fields = record_fields = self._compile_fields()
+        if self.codec.stats is None and all(
+            field[1].frame is None for field in record_fields
+        ):
+            # later records of this type are decoded without a frame
+            self.parse = self._parse_flat_dataclass
+            self.frame = None
+        return record_fields
+
+    def _compile_fields(self) -> List[Tuple[str, "DecoderPlan[Any]", Any, str]]:
+        projection = self.projection
+        compiled: List[Tuple[str, DecoderPlan[Any], Any, str]] = []
+        template: Dict[str, Any] = {}
+        record_fields = _record_fields(self.real_type)
+        if projection is not None:
+            _check_projected_names(
+                self.real_type, projection, {field[0] for field in record_fields}
+            )
+        for field_name, field_type, default in record_fields:
+            if projection is not None and field_name not in projection:
+                # never visited, the field keeps its default
+                if isinstance(default, _DefaultFactory):
+                    template[field_name] = None
+                    self.skipped_factories.append((field_name, default.factory))
+                elif default is MISSING:
+                    template[field_name] = SKIPPED
+                elif default is not _OMITTED:
+                    template[field_name] = default
+                continue
+
+            template[field_name] = None
+            compiled.append(
+                (
+                    field_name,
+                    self.codec.compile_decoder(
+                        field_type,
+                        self.numeric_arrays,
+                        None if projection is None else projection[field_name],
+                        self.interning,
+                    ),
+                    default,
+                    ".{}".format(field_name),
                 )
             )
-        except AssertionError as e:
-            error = ValidationError(
-                str(e),
+        if projection is not None:
+            self.kwargs_template = template
+        return compiled
+
+    def _new_kwargs(self) -> Dict[str, Any]:
+        # keeps the declaration order the constructors rely on
+        kwargs = dict(self.kwargs_template)  # type: ignore
+        for field_name, factory in self.skipped_factories:
+            kwargs[field_name] = factory()
+        return kwargs
+
+    def _parse_flat_dataclass(
+        self,
+        value: Any,
+        parent: "Optional[_Frame]",
+        segment: JsonPathSegment,
+        located_errors: List[LocatedValidationError],
+        skip_raise: bool,
+    ) -> ParseProcessResult[T]:
+        # every field decodes without a frame, so valid records are built
+        # right here and anything else goes through a frame to report errors
+        positional = self.positional_fields
+        if positional is not None and type(value) is list:
+            if len(value) <= len(positional):
+                value = dict(zip(positional, value))
+        if type(value) is dict:
+            kwargs: Dict[str, Any] = (
+                {} if self.kwargs_template is None else self._new_kwargs()
             )
-            if not skip_raise:
-                located_errors.append(
-                    LocatedValidationError(
-                        message=str(error),
-                        json_path=json_path,
-                    )
-                )
-            return ParseProcessResult(error)
-    elif issubclass(real_type, Enum):
+            fields: List[Tuple[str, DecoderPlan[Any], Any, str]] = self.fields  # type: ignore
+            for field_name, field_plan, default, field_path in fields:
+                if field_name not in value:
+                    if default is MISSING:
+                        break
+                    elif isinstance(default, _DefaultFactory):
+                        kwargs[field_name] = default.factory()
+                    elif default is not _OMITTED:
+                        kwargs[field_name] = default
+                    continue
+
+                leaf = field_plan.leaf
+                if leaf is not None:
+                    result = leaf(value[field_name])
+                    if isinstance(result, ValidationErrorBase):
+                        break
+                    if field_plan.convert is not None:
+                        result = field_plan.convert(result)
+                else:
+                    errors: List[LocatedValidationError] = []
+                    result = field_plan.parse(
+                        value[field_name], None, field_path, errors, True
+                    ).result
+                    if errors or isinstance(result, Exception):
+                        break
+                kwargs[field_name] = result
+            else:
+                try:
+                    return ParseProcessResult(self.construct(kwargs))  # type: ignore
+                except AssertionError:
+                    pass
+
+        frame = _DataclassFrame(self, value, parent, segment, skip_raise)
         try:
-            value = real_type(value)
-            return ParseProcessResult(value)
-        except ValueError:
-            error = ValidationError(
-                "Invalid enum value for {}: {} | valid types: {}".format(
-                    real_type,
-                    value,
-                    ", ".join(k for k, v in real_type.__members__.items()),
+            frame.send(None, located_errors)
+        except AssertionError as e:
+            frame.fail(e, located_errors)
+        return cast(ParseProcessResult[T], frame.result)
+
+    def _parse_enum(
+        self,
+        value: Any,
+        parent: "Optional[_Frame]",
+        segment: JsonPathSegment,
+        located_errors: List[LocatedValidationError],
+        skip_raise: bool,
+    ) -> ParseProcessResult[T]:
+        members = self.enum_members
+        if members is not None:
+            try:
+                return ParseProcessResult(members[value])
+            except (KeyError, TypeError):
+                pass
+        if self.enum_lookup is not None:
+            try:
+                return ParseProcessResult(self.enum_lookup(value))
+            except ValueError:
+                pass
+
+        error = InvalidEnumValue(self.real_type, value)
+        if not skip_raise:
+            located_errors.append(
+                LocatedValidationError(
+                    message=str(error),
+                    json_path=_render_json_path(parent, segment),
                 )
             )
-            if not skip_raise:
-                located_errors.append(
-                    LocatedValidationError(
-                        message=str(error),
-                        json_path=json_path,
+        return ParseProcessResult(error)
+
+
+def _compile_enum_lookup(
+    enum_type: Type[Enum],
+) -> Tuple[Optional[Dict[Any, Any]], Optional[Callable[[Any], Any]]]:
+    # a value to member table answers hits and misses without calling the
+    # enum, which is only asked when it may resolve values on its own
+    try:
+        members: Optional[Dict[Any, Any]] = {
+            member.value: member for member in enum_type
+        }
+    except TypeError:
+        # unhashable member values
+        return None, enum_type
+    missing = getattr(enum_type._missing_, "__func__", None)
+    if missing is Enum._missing_.__func__:  # type: ignore
+        return members, None
+    return members, enum_type
+
+
+def _compile_constructor(cls: Type[Any]) -> Callable[[Dict[str, Any]], Any]:
+    if is_typeddict(cls):
+        # kwargs are a fresh dict for every value, which is what a TypedDict is
+        def construct_dict(kwargs: Dict[str, Any]) -> Any:
+            return kwargs
+
+        return construct_dict
+
+    if is_named_tuple(cls):
+
+        def construct_tuple(kwargs: Dict[str, Any]) -> Any:
+            return cls(*kwargs.values())
+
+        return construct_tuple
+
+    # kwargs hold every field in declaration order
+    dataclass_fields = cast(AssumeDataclass, cls).__dataclass_fields__
+    init_fields = [
+        field
+        for field in fields(cls)
+        if field.init and getattr(field, "kw_only", False) is not True
+    ]
+    if len(init_fields) != len(dataclass_fields):
+        # init=False, keyword only or InitVar fields
+        def construct_with_keywords(kwargs: Dict[str, Any]) -> Any:
+            return cls(**kwargs)
+
+        return construct_with_keywords
+
+    if not _has_generated_init(cls):
+        # a hand written __init__ may take the fields in any order
+        def construct_by_name(kwargs: Dict[str, Any]) -> Any:
+            return cls(**kwargs)
+
+        return construct_by_name
+
+    if _fills_dict_on_init(cls):
+        new = object.__new__
+
+        def construct_instance(kwargs: Dict[str, Any]) -> Any:
+            instance = new(cls)
+            instance.__dict__.update(kwargs)
+            return instance
+
+        return construct_instance
+
+    def construct_with_arguments(kwargs: Dict[str, Any]) -> Any:
+        return cls(*kwargs.values())
+
+    return construct_with_arguments
+
+
+def _has_generated_init(cls: Type[Any]) -> bool:
+    # whether __init__ is the one dataclass wrote, which takes the fields in
+    # declaration order
+    init = getattr(cls.__init__, "__code__", None)
+    return bool(
+        init is not None
+        and init.co_filename == "<string>"
+        and cast(Any, cls).__dataclass_params__.init
+    )
+
+
+def _fills_dict_on_init(cls: Type[Any]) -> bool:
+    # whether __init__ does nothing but store the fields in the instance dict,
+    # so the dict can be filled without calling it
+    members: Any = cls
+    if (
+        hasattr(cls, "__post_init__")
+        or members.__new__ is not object.__new__
+        or any("__slots__" in vars(base) for base in cls.__mro__)
+    ):
+        return False
+    if not members.__dataclass_params__.frozen and (
+        members.__setattr__ is not object.__setattr__
+    ):
+        return False
+    # descriptors on the class would be bypassed
+    return not any(
+        hasattr(type(getattr_static(cls, name, None)), "__set__")
+        for name in cast(AssumeDataclass, cls).__dataclass_fields__
+    )
+
+
+class _DefaultFactory:
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self.factory = factory
+
+
+_OMITTED = object()
+
+
+_ChildRequest = Tuple[DecoderPlan[Any], Any, JsonPathSegment, bool]
+
+
+class _Frame:
+    # frames link to their parent so the JSON path of a value is only rendered
+    # when an error is reported
+    __slots__ = (
+        "plan",
+        "value",
+        "parent",
+        "segment",
+        "skip_raise",
+        "result",
+        "stepwise",
+    )
+
+    plan: DecoderPlan[Any]
+    value: Any
+    parent: "Optional[_Frame]"
+    segment: JsonPathSegment
+    skip_raise: bool
+    result: ParseProcessResult[Any]
+    # set while decoding with a budget or stats, so the engine decodes every
+    # child itself instead of the frame decoding some of them inline
+    stepwise: bool
+
+    def send(
+        self,
+        child_result: Optional[ParseProcessResult[Any]],
+        located_errors: List[LocatedValidationError],
+    ) -> Optional[_ChildRequest]:
+        # resumes with the result of the last requested child (None on the first
+        # call) and returns the next child to decode, or None once result is set
+        raise NotImplementedError()
+
+
+class _DecoderFrame(_Frame):
+    __slots__ = ("generator",)
+
+    def __init__(
+        self,
+        plan: DecoderPlan[Any],
+        value: Any,
+        parent: Optional[_Frame],
+        segment: JsonPathSegment,
+        skip_raise: bool,
+    ) -> None:
+        self.plan = plan
+        self.value = value
+        self.parent = parent
+        self.segment = segment
+        self.skip_raise = skip_raise
+        self.stepwise = False
+        self.generator = plan.parser.parse(value, *plan.type_args)  # type: ignore
+
+    def send(
+        self,
+        child_result: Optional[ParseProcessResult[Any]],
+        located_errors: List[LocatedValidationError],
+    ) -> Optional[_ChildRequest]:
+        generator = self.generator
+        children = self.plan.children
+        try:
+            while True:
+                parsed_yield = generator.send(child_result)  # type: ignore
+                child_type = parsed_yield.type_
+                # codecs yield the same type argument objects over and over, so
+                # children are remembered by identity instead of hashing types
+                child = children.get(id(child_type))
+                if child is None or child[0] is not child_type:
+                    child = (
+                        child_type,
+                        self.plan.codec.compile_decoder(
+                            child_type,
+                            self.plan.numeric_arrays,
+                            self.plan.member_projections.get(
+                                child_type, self.plan.child_projection
+                            ),
+                            self.plan.interning,
+                        ),
+                    )
+                    children[id(child_type)] = child
+                child_plan = child[1]
+                # children of a value being tried by a union fail quietly too
+                skip_raise = parsed_yield.skip_raise or self.skip_raise
+                if child_plan.frame is not None or self.stepwise:
+                    return (
+                        child_plan,
+                        parsed_yield.value,
+                        parsed_yield.json_path,
+                        skip_raise,
                     )
+                child_result = child_plan.parse(
+                    parsed_yield.value,
+                    self,
+                    parsed_yield.json_path,
+                    located_errors,
+                    skip_raise,
+                )
+        except StopIteration as e:
+            final = e.value
+
+        if not isinstance(final, ParseProcessResult):
+            raise ValueError(
+                f"Parser {self.plan.parser} did not return a ParseProcessResult"
+            )
+        if isinstance(final.result, Exception) and not self.skip_raise:
+            located_errors.append(
+                LocatedValidationError(
+                    message=str(final.result),
+                    json_path=_render_json_path(self.parent, self.segment),
                 )
-            return ParseProcessResult(error)
+            )
 
-    else:
-        raise ValueError(f"Unsupported type: {type_}")
+        if self.plan.convert is not None:
+            if not isinstance(final.result, Exception):
+                final = ParseProcessResult(
+                    result=self.plan.convert(final.result),
+                )
+            else:
+                final = ParseProcessResult(
+                    result=None,
+                )
 
+        self.result = final
+        return None
 
-def __parse_dataclass(
-    value: Any,
-    type_: Type[T],
-    json_path: str = "$",
-    located_errors: List[LocatedValidationError] = [],
-) -> T:
-    assert isinstance(value, dict), "Value must be a dict"
 
-    assert is_dataclass(type_), "Type must be a dataclass"
+class _DataclassFrame(_Frame):
+    __slots__ = ("kwargs", "index")
 
-    fields = cast(AssumeDataclass, type_).__dataclass_fields__
+    def __init__(
+        self,
+        plan: DecoderPlan[Any],
+        value: Any,
+        parent: Optional[_Frame],
+        segment: JsonPathSegment,
+        skip_raise: bool,
+    ) -> None:
+        self.plan = plan
+        self.value = value
+        self.parent = parent
+        self.segment = segment
+        self.skip_raise = skip_raise
+        self.stepwise = False
+        self.kwargs: Dict[str, Any] = {}
+        self.index = 0
 
-    kwargs: Dict[str, Any] = {}
+    def send(
+        self,
+        child_result: Optional[ParseProcessResult[Any]],
+        located_errors: List[LocatedValidationError],
+    ) -> Optional[_ChildRequest]:
+        value = self.value
+        plan = self.plan
+        kwargs = self.kwargs
+        if child_result is None:
+            positional = plan.positional_fields
+            if positional is not None and type(value) is list:
+                assert len(value) <= len(
+                    positional
+                ), "Expected at most {} items".format(len(positional))
+                value = self.value = dict(zip(positional, value))
+            assert isinstance(value, dict), "Value must be a dict"
+            if plan.fields is None:
+                plan._compile_record()
+            if plan.kwargs_template is not None:
+                kwargs = self.kwargs = plan._new_kwargs()
+        else:
+            if self.skip_raise and isinstance(child_result.result, Exception):
+                self.result = child_result
+                return None
+            kwargs[plan.fields[self.index][0]] = child_result.result  # type: ignore
+            self.index += 1
 
-    for field_name, field in fields.items():
-        field_json_path = "{}.{}".format(json_path, field_name)
+        fields: List[Tuple[str, DecoderPlan[Any], Any, str]] = plan.fields  # type: ignore
+        index = self.index
+        while index < len(fields):
+            field_name, field_plan, default, field_path = fields[index]
+            index += 1
 
-        if field_name not in value:
-            if field.default is not None and field.default is not MISSING:
-                kwargs[field_name] = field.default
-            elif field.default_factory is not None and field.default_factory is not MISSING:  # type: ignore
-                kwargs[field_name] = field.default_factory()  # type: ignore
-            else:
-                kwargs[field_name] = None
-                located_errors.append(
-                    LocatedValidationError(
-                        message="Missing required field: {}".format(field_name),
-                        json_path=json_path,
+            if field_name not in value:
+                if default is MISSING:
+                    if self.skip_raise:
+                        # unions trying their members only need to know it failed
+                        self.result = ParseProcessResult(
+                            ValidationError(
+                                "Missing required field: {}".format(field_name)
+                            )
+                        )
+                        return None
+                    kwargs[field_name] = None
+                    located_errors.append(
+                        LocatedValidationError(
+                            message="Missing required field: {}".format(field_name),
+                            json_path=_render_json_path(self.parent, self.segment),
+                        )
                     )
+                elif isinstance(default, _DefaultFactory):
+                    kwargs[field_name] = default.factory()
+                elif default is not _OMITTED:
+                    kwargs[field_name] = default
+                continue
+
+            field_value = value[field_name]
+            leaf = field_plan.leaf
+            if leaf is not None and field_plan.convert is None:
+                # valid leaves skip the result wrapper, errors are reported by parse
+                result = leaf(field_value)
+                if not isinstance(result, ValidationErrorBase):
+                    kwargs[field_name] = result
+                    continue
+
+            if field_plan.frame is not None or self.stepwise:
+                self.index = index - 1
+                return (field_plan, field_value, field_path, self.skip_raise)
+
+            result = field_plan.parse(
+                field_value,
+                self,
+                field_path,
+                located_errors,
+                self.skip_raise,
+            ).result
+            if self.skip_raise and isinstance(result, Exception):
+                self.result = ParseProcessResult(result)
+                return None
+            kwargs[field_name] = result
+
+        self.result = ParseProcessResult(plan.construct(kwargs))  # type: ignore
+        return None
+
+    def fail(
+        self, error: AssertionError, located_errors: List[LocatedValidationError]
+    ) -> None:
+        validation_error = ValidationError(
+            str(error),
+        )
+        if not self.skip_raise:
+            located_errors.append(
+                LocatedValidationError(
+                    message=str(validation_error),
+                    json_path=_render_json_path(self.parent, self.segment),
                 )
-            continue
+            )
+        self.result = ParseProcessResult(validation_error)
 
-        parsed_value = __parse_value(
-            value[field_name],
-            field.type,
-            field_json_path,
-            located_errors,
+
+def _check_projected_names(
+    type_: Any, projection: Projection, names: Set[str]
+) -> None:
+    unknown = [name for name in projection.fields if name not in names]
+    if unknown:
+        raise ValueError(
+            "Unknown fields in projection for {}: {}".format(
+                get_class_or_type_name(type_), ", ".join(sorted(unknown))
+            )
         )
 
-        kwargs[field_name] = parsed_value.result
 
-    return cast(Callable[..., T], type_)(**kwargs)
+def _may_hold_fields(type_: Any) -> bool:
+    # whether a union member other than a record can be projected into
+    while is_new_type(type_):
+        type_ = get_new_type_supertype(type_)
+    if type_ is Any:
+        return True
+    origin: Any = getattr(type_, "__origin__", None)
+    return is_generic(type_) and origin is not Literal
+
+
+def _member_projections(
+    union_type: Any, members: Tuple[Any, ...], projection: Projection
+) -> Dict[Any, Projection]:
+    member_projections: Dict[Any, Projection] = {}
+    names: Set[str] = set()
+    for member in members:
+        if is_record(member):
+            member_names = {field[0] for field in _record_fields(member)}
+            names.update(member_names)
+            member_projections[member] = projection.only(member_names)
+    if not any(_may_hold_fields(member) for member in members if not is_record(member)):
+        # every name has to be declared by one of the records
+        _check_projected_names(union_type, projection, names)
+    return member_projections
+
+
+def _is_frozen_dataclass(cls: Any) -> bool:
+    params = getattr(cls, "__dataclass_params__", None)
+    return params is not None and params.frozen
+
+
+def _is_hashable_record(cls: Any) -> bool:
+    # records compared on all of their fields, so equal ones hold the same data
+    if is_named_tuple(cls):
+        return cls.__eq__ is tuple.__eq__
+    params = getattr(cls, "__dataclass_params__", None)
+    if params is None or not params.frozen or not params.eq:
+        return False
+    eq = getattr(vars(cls).get("__eq__"), "__code__", None)
+    return (
+        eq is not None
+        and eq.co_filename == "<string>"
+        and all(field.compare for field in fields(cls))
+    )
+
+
+def _interning_leaf(decode: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def decode_interned(value: Any) -> Any:
+        result = decode(value)
+        if type(result) is str:
+            return current_interner.get().string(result)
+        return result
 
+    return decode_interned
 
-def decode(value: Any, type_: Type[T]) -> T:
-    errors: List[LocatedValidationError] = []
-    parsed_value = __parse_value(value, type_, located_errors=errors)
-    if len(errors):
-        raise LocatedValidationErrorCollection(errors)
 
-    if isinstance(parsed_value.result, Exception):
-        raise parsed_value.result
+def _interning_constructor(
+    construct: Callable[[Dict[str, Any]], Any]
+) -> Callable[[Dict[str, Any]], Any]:
+    def construct_interned(kwargs: Dict[str, Any]) -> Any:
+        return current_interner.get().record(construct(kwargs))
 
-    return parsed_value.result
+    return construct_interned
+
+
+def _render_json_path(parent: Optional[_Frame], segment: JsonPathSegment) -> str:
+    segments = [format_json_path_segment(segment)]
+    while parent is not None:
+        segments.append(format_json_path_segment(parent.segment))
+        parent = parent.parent
+    return "".join(reversed(segments))
+
+
+class _FrameTimer:
+    # [start, time of children, errors before, errors of children] for each
+    # open frame, children add to their parent so frames know their own share
+    __slots__ = ("stats", "open")
+
+    def __init__(self, stats: DecodeStats) -> None:
+        self.stats = stats
+        self.open: List[List[Any]] = []
+
+    def push(self, located_errors: List[LocatedValidationError]) -> None:
+        self.open.append([perf_counter(), 0.0, len(located_errors), 0])
+
+    def pop(
+        self, frame: Optional[_Frame], located_errors: List[LocatedValidationError]
+    ) -> None:
+        # frames unwound by a failed assertion have no result and are not recorded
+        start, children_time, errors_before, children_errors = self.open.pop()
+        total_time = perf_counter() - start
+        new_errors = len(located_errors) - errors_before
+        if frame is not None:
+            own_errors = max(new_errors - children_errors, 0)
+            if not own_errors and isinstance(frame.result.result, Exception):
+                own_errors = 1
+            self.stats.record(
+                frame.plan.type_,
+                total_time,
+                total_time - children_time,
+                own_errors,
+                frame.parent,
+                frame.segment,
+                _render_json_path,
+            )
+        self.add_child(total_time, new_errors)
+
+    def add_child(self, elapsed: float, errors: int) -> None:
+        if self.open:
+            self.open[-1][1] += elapsed
+            self.open[-1][3] += errors
+
+    def shift(self, paused: float) -> None:
+        # time spent handing control back to the event loop is not decoding
+        for timing in self.open:
+            timing[0] += paused
+
+
+def _parse_value(
+    plan: DecoderPlan[T],
+    value: Any,
+    parent: Optional[_Frame],
+    segment: JsonPathSegment,
+    located_errors: List[LocatedValidationError],
+    skip_raise: bool,
+) -> ParseProcessResult[T]:
+    steps = _drive_frames(
+        plan, value, parent, segment, located_errors, skip_raise, None
+    )
+    try:
+        next(steps)
+    except StopIteration as e:
+        return cast(ParseProcessResult[T], e.value)
+    raise RuntimeError("Decoding without a budget must not pause")
+
+
+def _drive_frames(
+    plan: DecoderPlan[T],
+    value: Any,
+    parent: Optional[_Frame],
+    segment: JsonPathSegment,
+    located_errors: List[LocatedValidationError],
+    skip_raise: bool,
+    budget: Optional[int],
+) -> Generator[None, None, ParseProcessResult[T]]:
+    # Drives nested decoders with an explicit stack of frames instead of
+    # recursion, so the depth of the document is not bound by the interpreter
+    # stack. With a budget, pauses after that many frame steps so the caller
+    # can hand control back to an event loop; items of containers are not
+    # decoded inline then, so each of them counts as a step. Plans compiled
+    # with stats have every frame timed here, step by step.
+    stack: List[_Frame] = []
+    result: Optional[ParseProcessResult[Any]]
+    steps = 0
+    stepwise = budget is not None or plan.stats is not None
+    timer = None if plan.stats is None else _FrameTimer(plan.stats)
+    while True:
+        if plan.frame is not None:
+            parent = plan.frame(plan, value, parent, segment, skip_raise)
+            parent.stepwise = stepwise
+            stack.append(parent)
+            if timer is not None:
+                timer.push(located_errors)
+            result = None
+        elif timer is not None and stack:
+            start = perf_counter()
+            errors_before = len(located_errors)
+            result = plan.parse(value, parent, segment, located_errors, skip_raise)
+            timer.add_child(perf_counter() - start, len(located_errors) - errors_before)
+        else:
+            result = plan.parse(value, parent, segment, located_errors, skip_raise)
+
+        while stack:
+            if budget is not None:
+                steps += 1
+                if steps >= budget:
+                    steps = 0
+                    paused = perf_counter()
+                    yield
+                    if timer is not None:
+                        timer.shift(perf_counter() - paused)
+
+            frame = stack[-1]
+            try:
+                request = frame.send(result, located_errors)
+            except AssertionError as e:
+                # assertions fail the innermost dataclass being decoded
+                while not isinstance(frame, _DataclassFrame):
+                    stack.pop()
+                    if timer is not None:
+                        timer.pop(None, located_errors)
+                    if not stack:
+                        raise
+                    frame = stack[-1]
+                frame.fail(e, located_errors)
+                request = None
+
+            if request is not None:
+                plan, value, segment, skip_raise = request
+                parent = frame
+                break
+
+            stack.pop()
+            if timer is not None:
+                timer.pop(frame, located_errors)
+            result = frame.result
+        else:
+            return cast(ParseProcessResult[T], result)
+
+
+def _is_decimal(type_: Any) -> bool:
+    return isinstance(type_, type) and issubclass(type_, Decimal)
+
+
+def _tells_floats_apart(type_: Any) -> bool:
+    # Any keeps the parsed value, unions pick float members by exact type and
+    # Literal compares values, so a Decimal would come out different
+    if type_ is Any:
+        return True
+    if not is_generic(type_):
+        return False
+    origin: Any = cast(AssumeGeneric, type_).__origin__
+    args: Tuple[Any, ...] = cast(AssumeGeneric, type_).__args__
+    if origin is Literal:
+        return any(type(arg) is float for arg in args)
+    if origin is Union:
+        return float in args and any(
+            arg is not float and arg is not type(None) for arg in args
+        )
+    return False
+
+
+def _type_tree_contains(type_: Any, matches: Callable[[Any], bool]) -> bool:
+    seen: Set[int] = set()
+    pending = [type_]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+
+        if matches(current):
+            return True
+        if is_new_type(current):
+            pending.append(get_new_type_supertype(current))
+        elif is_generic(current):
+            pending.extend(cast(AssumeGeneric, current).__args__)
+        elif is_record(current):
+            pending.extend(field[1] for field in _record_fields(current))
+    return False
 
 
 def optional(T: Type[T]) -> Type[T]:
     return Optional[T]  # type: ignore
 
 
-def __encode(value: Any) -> Any:
-    if isinstance(value, Enum):
-        return value.value
-    if isinstance(value, datetime):
-        return serialize_datetime(value)
-    if isinstance(value, date):
-        return serialize_date(value)
-    if isinstance(value, time):
-        return serialize_time(value)
-    if isinstance(value, Enum):
-        return value.value
-    if isinstance(value, (Decimal, UUID, str)):
-        return str(value)
-    if isinstance(value, (int, float, bool)):
-        return value
-    if isinstance(value, (list, tuple)):
-        return [__encode(v) for v in value]
-    if isinstance(value, dict):
-        return {__encode(k): __encode(v) for k, v in value.items()}
-    if is_dataclass(value):
-        return __encode(asdict(value))
-    if isinstance(value, bytes):
-        return base64.b64encode(value).decode("utf-8")
-    if value is None:
-        return None
-    raise ValueError(f"Unsupported type: {type(value)}")
+def _encode_unchanged(value: Any) -> Any:
+    return value
+
+
+# reads the member's value slot instead of going through the value property
+_encode_enum: Callable[[Enum], Any] = attrgetter("_value_")
+
+
+def _encode_bytes(value: bytes) -> Any:
+    return base64.b64encode(value).decode("utf-8")
+
+
+def _encode_numeric_array(value: Any) -> Any:
+    # array.array and numpy arrays decoded with numeric_arrays= become lists again
+    return value.tolist()
+
+
+# list, tuple and dict encoders call back into their codec, so each codec
+# installs its own next to these
+typers_encoders: Dict[Any, Callable[[Any], Any]] = {
+    str: _encode_unchanged,
+    int: _encode_unchanged,
+    float: _encode_unchanged,
+    bool: _encode_unchanged,
+    type(None): _encode_unchanged,
+    Decimal: str,
+    UUID: str,
+    datetime: serialize_datetime,
+    date: serialize_date,
+    time: serialize_time,
+    bytes: _encode_bytes,
+    array: _encode_numeric_array,
+}
+
+_BUILTIN_ENCODERS = dict(typers_encoders)
+
+
+# paths to decode, such as {"id", "customer.email", "items[*].sku"}
+Include = Union[Projection, Iterable[str]]
+
+# (type, numeric_arrays, projection, interning) -> plan
+_PlanLookup = Callable[
+    [Any, Optional[str], Optional[Projection], bool], "DecoderPlan[Any]"
+]
+
+
+def _as_projection(include: Optional[Include]) -> Optional[Projection]:
+    if include is None or isinstance(include, Projection):
+        return include
+    return Projection(include)
+
+
+def _shared_interner(intern: Union[bool, Interner]) -> Optional[Interner]:
+    # True interns within each call, an Interner is kept across calls
+    return intern if isinstance(intern, Interner) else None
+
+
+class Codec:
+    def __init__(
+        self,
+        decoders: Optional[Dict[Any, TypeDecoder[Any]]] = None,
+        encoders: Optional[Dict[Any, Callable[[Any], Any]]] = None,
+        cache_size: Optional[int] = DECODER_CACHE_SIZE,
+    ) -> None:
+        # registries that are passed in are used as they are, otherwise the
+        # codec starts from its own copy of the built-in ones
+        self.typers_parsers = dict(_BUILTIN_PARSERS) if decoders is None else decoders
+        typers_encoders = dict(_BUILTIN_ENCODERS) if encoders is None else encoders
+        self.typers_encoders = typers_encoders
+        self._plan_cache = lru_cache(maxsize=cache_size)(self._build_plan)
+        # looked up through a typed alias, the lru_cache wrapper takes any
+        # Hashable and returns the plan for whatever type it was given
+        self._plans: _PlanLookup = self._plan_cache
+        # text writers compiled by json_text for this codec
+        self._text_writers: Dict[Any, Any] = {}
+        self._text_encoder: Any = None
+        self.stats: Optional[DecodeStats] = None
+        self.encode_cache: Optional[EncodeCache] = None
+
+        def encode(value: Any) -> Any:
+            try:
+                encoder = typers_encoders[type(value)]
+            except KeyError:
+                encoder = self.compile_encoder(type(value))
+            return encoder(value)
+
+        def encode_list(value: Any) -> Any:
+            return [encode(v) for v in value]
+
+        def encode_dict(value: Dict[Any, Any]) -> Any:
+            return {encode(k): encode(v) for k, v in value.items()}
+
+        self.encode = encode
+        self.encode_list = encode_list
+        self.encode_dict = encode_dict
+        typers_encoders.setdefault(list, encode_list)
+        typers_encoders.setdefault(tuple, encode_list)
+        typers_encoders.setdefault(dict, encode_dict)
+
+    def _build_plan(
+        self,
+        type_: Type[T],
+        numeric_arrays: Optional[str],
+        projection: Optional[Projection],
+        interning: bool,
+    ) -> DecoderPlan[T]:
+        return DecoderPlan(type_, numeric_arrays, self, projection, interning)
+
+    def compile_decoder(
+        self,
+        type_: Type[T],
+        numeric_arrays: Optional[str] = None,
+        projection: Optional[Projection] = None,
+        interning: bool = False,
+    ) -> DecoderPlan[T]:
+        plan: DecoderPlan[T] = self._plans(type_, numeric_arrays, projection, interning)
+        return plan
+
+    def decode(
+        self,
+        value: Any,
+        type_: Type[T],
+        numeric_arrays: Optional[str] = None,
+        include: Optional[Include] = None,
+        intern: Union[bool, Interner] = False,
+    ) -> T:
+        plan: DecoderPlan[T] = self._plans(
+            type_, numeric_arrays, _as_projection(include), bool(intern)
+        )
+        return plan.decode(value, _shared_interner(intern))
+
+    def decode_bytes(
+        self,
+        data: bytes,
+        type_: Type[T],
+        loads: Optional[JsonLoads] = None,
+        numeric_arrays: Optional[str] = None,
+        include: Optional[Include] = None,
+        intern: Union[bool, Interner] = False,
+    ) -> T:
+        plan: DecoderPlan[T] = self._plans(
+            type_, numeric_arrays, _as_projection(include), bool(intern)
+        )
+        return plan.decode_json(data, loads, _shared_interner(intern))
+
+    def decode_str(
+        self,
+        text: str,
+        type_: Type[T],
+        loads: Optional[JsonLoads] = None,
+        numeric_arrays: Optional[str] = None,
+        include: Optional[Include] = None,
+        intern: Union[bool, Interner] = False,
+    ) -> T:
+        plan: DecoderPlan[T] = self._plans(
+            type_, numeric_arrays, _as_projection(include), bool(intern)
+        )
+        return plan.decode_json(text, loads, _shared_interner(intern))
+
+    def compile_encoder(self, cls: Type[Any]) -> Callable[[Any], Any]:
+        encoder = self.typers_encoders.get(cls)
+        if encoder is not None:
+            return encoder
+
+        if issubclass(cls, Enum):
+            encoder = _encode_enum
+        elif issubclass(cls, datetime):
+            encoder = serialize_datetime
+        elif issubclass(cls, date):
+            encoder = serialize_date
+        elif issubclass(cls, time):
+            encoder = serialize_time
+        elif issubclass(cls, (Decimal, UUID, str)):
+            encoder = str
+        elif issubclass(cls, (int, float, bool)):
+            encoder = _encode_unchanged
+        elif issubclass(cls, (list, tuple)):
+            encoder = self.encode_list
+        elif issubclass(cls, dict):
+            encoder = self.encode_dict
+        elif is_dataclass(cls):
+            encoder = _compile_record_encoder(
+                tuple(field.name for field in fields(cls)), self.encode
+            )
+            if self.encode_cache is not None and _is_frozen_dataclass(cls):
+                encoder = _cached_encoder(encoder, self.encode_cache)
+        elif issubclass(cls, bytes):
+            encoder = _encode_bytes
+        elif issubclass(cls, array) or (
+            numpy is not None and issubclass(cls, numpy.ndarray)
+        ):
+            encoder = _encode_numeric_array
+        else:
+            raise ValueError(f"Unsupported type: {cls}")
+
+        # a single dict assignment, so concurrent encoders at worst compile twice
+        self.typers_encoders[cls] = encoder
+        return encoder
+
+    def register_decoder(self, type_: Any, decoder: TypeDecoder[Any]) -> None:
+        self.typers_parsers[type_] = decoder
+        self.clear_cache()
+
+    def register_encoder(self, type_: Any, encoder: Callable[[Any], Any]) -> None:
+        self.typers_encoders[type_] = encoder
+        self._text_writers = {}
+        self._text_encoder = None
+
+    def instrument(self, stats: Optional[DecodeStats]) -> None:
+        # plans compiled from now on record into stats, None turns it off;
+        # plans already held by callers keep decoding as they were compiled
+        self.stats = stats
+        self.clear_cache()
+
+    def use_encode_cache(self, cache: Optional[EncodeCache]) -> None:
+        # compiled record encoders are dropped so they pick the cache up (or
+        # let go of it), encoders registered by hand are kept
+        self.encode_cache = cache
+        for cls, encoder in list(self.typers_encoders.items()):
+            if hasattr(encoder, "field_names") or hasattr(encoder, "encode_cache"):
+                del self.typers_encoders[cls]
+        self._text_writers = {}
+        self._text_encoder = None
+
+    def clear_cache(self) -> None:
+        self._plan_cache.cache_clear()
+
+    def cache_info(self) -> Any:
+        return self._plan_cache.cache_info()
+
+
+def _compile_record_encoder(
+    field_names: Tuple[str, ...], encode: Callable[[Any], Any]
+) -> Callable[[Any], Any]:
+    def encode_record(value: Any) -> Any:
+        return {name: encode(getattr(value, name)) for name in field_names}
+
+    # lets text encoders walk the fields without building the dict
+    encode_record.field_names = field_names  # type: ignore
+    return encode_record
+
+
+def _cached_encoder(
+    encoder: Callable[[Any], Any], cache: EncodeCache
+) -> Callable[[Any], Any]:
+    def encode_cached(value: Any) -> Any:
+        # hits hand out the cached dict itself, callers must not change it
+        return cache.lookup(id(value), encoder, value)
+
+    # text encoders keep their own entries of rendered JSON in the same cache
+    encode_cached.encode_cache = cache  # type: ignore
+    encode_cached.uncached = encoder  # type: ignore
+    return encode_cached
+
+
+# the module level functions share their registries with this codec
+default_codec = Codec(typers_parsers, typers_encoders)
+
+
+def compile_decoder(
+    type_: Type[T],
+    numeric_arrays: Optional[str] = None,
+    projection: Optional[Projection] = None,
+    interning: bool = False,
+) -> DecoderPlan[T]:
+    return default_codec.compile_decoder(type_, numeric_arrays, projection, interning)
+
+
+def decode(
+    value: Any,
+    type_: Type[T],
+    numeric_arrays: Optional[str] = None,
+    include: Optional[Include] = None,
+    intern: Union[bool, Interner] = False,
+) -> T:
+    return default_codec.decode(value, type_, numeric_arrays, include, intern)
+
+
+def decode_bytes(
+    data: bytes,
+    type_: Type[T],
+    loads: Optional[JsonLoads] = None,
+    numeric_arrays: Optional[str] = None,
+    include: Optional[Include] = None,
+    intern: Union[bool, Interner] = False,
+) -> T:
+    return default_codec.decode_bytes(
+        data, type_, loads, numeric_arrays, include, intern
+    )
+
+
+def decode_str(
+    text: str,
+    type_: Type[T],
+    loads: Optional[JsonLoads] = None,
+    numeric_arrays: Optional[str] = None,
+    include: Optional[Include] = None,
+    intern: Union[bool, Interner] = False,
+) -> T:
+    return default_codec.decode_str(text, type_, loads, numeric_arrays, include, intern)
+
+
+def compile_encoder(cls: Type[Any]) -> Callable[[Any], Any]:
+    return default_codec.compile_encoder(cls)
 
 
 def encode(value: Any) -> Any:
-    return __encode(value)
+    return default_codec.encode(value)
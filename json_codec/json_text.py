@@ -0,0 +1,315 @@
+import json.encoder
+import sys
+from itertools import chain, repeat
+from json.encoder import JSONEncoder
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, cast
+
+from json_codec.codecs.date_codec import serialize_date
+from json_codec.codecs.datetime_codec import serialize_datetime
+from json_codec.codecs.time_codec import serialize_time
+from json_codec.encode_cache import EncodeCache
+from json_codec.json_codec import (
+    _BUILTIN_ENCODERS,
+    Codec,
+    _encode_bytes,
+    _encode_enum,
+    _encode_unchanged,
+    default_codec,
+)
+
+ENCODE_CHUNK_SIZE = 64 * 1024
+
+_INFINITY = float("inf")
+
+# the C string escaper json uses, which typeshed does not declare
+encode_basestring: Callable[[str], str] = (
+    getattr(json.encoder, "c_encode_basestring", None)
+    or json.encoder.py_encode_basestring
+)
+
+# a writer either renders a value to JSON text, converts it to another value to
+# write, or opens a container whose entries are (prefix, value) pairs
+_SCALAR = 0
+_CONVERT = 1
+_CONTAINER = 2
+
+_Entries = Iterator[Tuple[str, Any]]
+_Writer = Tuple[int, Callable[[Any], Any]]
+
+# writes values returned by encoders, which are not encoded again
+_plain_json = JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), check_circular=False
+)
+
+
+def _float_text(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == _INFINITY:
+        return "Infinity"
+    if value == -_INFINITY:
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _bool_text(value: bool) -> str:
+    return "true" if value else "false"
+
+
+def _null_text(value: None) -> str:
+    return "null"
+
+
+def _key_text(key: Any, encode: Callable[[Any], Any]) -> str:
+    if type(key) is not str:
+        key = encode(key)
+        if isinstance(key, bool):
+            key = _bool_text(key)
+        elif isinstance(key, int):
+            key = int.__repr__(key)
+        elif isinstance(key, float):
+            key = _float_text(key)
+        elif key is None:
+            key = "null"
+        elif not isinstance(key, str):
+            raise TypeError(
+                f"keys must be str, int, float, bool or None, not {type(key)}"
+            )
+    return encode_basestring(key)
+
+
+def _open_list(value: Any) -> Tuple[str, _Entries, str]:
+    return "[", zip(chain(("",), repeat(",")), value), "]"
+
+
+def _dict_entries(value: Dict[Any, Any], encode: Callable[[Any], Any]) -> _Entries:
+    separator = ""
+    for key, item in value.items():
+        yield separator + _key_text(key, encode) + ":", item
+        separator = ","
+
+
+def _compile_dict_opener(
+    encode: Callable[[Any], Any]
+) -> Callable[[Dict[Any, Any]], Tuple[str, _Entries, str]]:
+    def open_dict(value: Dict[Any, Any]) -> Tuple[str, _Entries, str]:
+        return "{", _dict_entries(value, encode), "}"
+
+    return open_dict
+
+
+def _compile_dataclass_opener(
+    field_names: Tuple[str, ...]
+) -> Callable[[Any], Tuple[str, _Entries, str]]:
+    prefixes = tuple(
+        ("," if index else "") + encode_basestring(name) + ":"
+        for index, name in enumerate(field_names)
+    )
+
+    def open_dataclass(value: Any) -> Tuple[str, _Entries, str]:
+        return "{", zip(prefixes, map(getattr, repeat(value), field_names)), "}"
+
+    return open_dataclass
+
+
+def _cached_text_writer(
+    codec: Codec, cache: EncodeCache, encoder: Callable[[Any], Any]
+) -> Callable[[Any], str]:
+    field_names = encoder.field_names  # type: ignore
+
+    def render(value: Any) -> str:
+        fields = {name: getattr(value, name) for name in field_names}
+        return "".join(iterencode(fields, chunk_size=sys.maxsize, codec=codec))
+
+    def write_cached(value: Any) -> str:
+        # the whole object is written from its cached text, nested records
+        # are only rendered when the object itself misses
+        return cast(str, cache.lookup((id(value), str), render, value))
+
+    return write_cached
+
+
+def _string_writer(encoder: Callable[[Any], str]) -> Callable[[Any], str]:
+    def write_string(value: Any) -> str:
+        return encode_basestring(encoder(value))
+
+    return write_string
+
+
+_STRING_ENCODERS = (
+    str,
+    serialize_datetime,
+    serialize_date,
+    serialize_time,
+    _encode_bytes,
+)
+
+
+def _json_writers(codec: Codec) -> Dict[Any, _Writer]:
+    writers: Dict[Any, _Writer] = codec._text_writers
+    if not writers:
+        # an empty table is seeded for the codec, racing threads seed equal ones
+        writers[dict] = (_CONTAINER, _compile_dict_opener(codec.encode))
+    return writers
+
+
+def _compile_json_writer(codec: Codec, cls: Any) -> _Writer:
+    writers = _json_writers(codec)
+    writer = writers.get(cls)
+    if writer is not None:
+        return writer
+
+    # follows the encoder resolved for the class, so custom typers_encoders
+    # entries are honoured by the text encoders too
+    encoder = codec.compile_encoder(cls)
+    field_names = getattr(encoder, "field_names", None)
+    cache = getattr(encoder, "encode_cache", None)
+    if cache is not None:
+        uncached = encoder.uncached  # type: ignore
+        writer = (_SCALAR, _cached_text_writer(codec, cache, uncached))
+    elif field_names is not None:
+        writer = (_CONTAINER, _compile_dataclass_opener(field_names))
+    elif encoder is codec.encode_list:
+        writer = (_CONTAINER, _open_list)
+    elif encoder is codec.encode_dict:
+        writer = writers[dict]
+    elif encoder in _STRING_ENCODERS:
+        writer = (_SCALAR, _string_writer(encoder))
+    elif encoder is _encode_unchanged and issubclass(cls, str):
+        writer = (_SCALAR, encode_basestring)
+    elif encoder is _encode_unchanged and issubclass(cls, bool):
+        writer = (_SCALAR, _bool_text)
+    elif encoder is _encode_unchanged and issubclass(cls, int):
+        writer = (_SCALAR, int.__repr__)
+    elif encoder is _encode_unchanged and issubclass(cls, float):
+        writer = (_SCALAR, _float_text)
+    elif encoder is _encode_unchanged and cls is type(None):
+        writer = (_SCALAR, _null_text)
+    else:
+        writer = (_CONVERT, encoder)
+
+    writers[cls] = writer
+    return writer
+
+
+def iterencode(
+    value: Any,
+    chunk_size: int = ENCODE_CHUNK_SIZE,
+    codec: Optional[Codec] = None,
+) -> Iterator[str]:
+    if codec is None:
+        codec = default_codec
+    writers = _json_writers(codec)
+    parts: List[str] = []
+    size = 0
+    stack: List[Tuple[_Entries, str]] = []
+    prefix = ""
+    while True:
+        writer = writers.get(type(value))
+        if writer is None:
+            writer = _compile_json_writer(codec, type(value))
+        kind, function = writer
+        if kind == _SCALAR:
+            text = prefix + function(value)
+        elif kind == _CONVERT:
+            # like encode, the converted value is taken as it is
+            text = prefix + _plain_json.encode(function(value))
+        else:
+            opening, entries, closing = function(value)
+            text = prefix + opening
+            stack.append((entries, closing))
+        parts.append(text)
+        size += len(text)
+
+        while stack:
+            entries, closing = stack[-1]
+            entry = next(entries, None)
+            if entry is not None:
+                prefix, value = entry
+                break
+            stack.pop()
+            parts.append(closing)
+            size += 1
+        else:
+            yield "".join(parts)
+            return
+
+        if size >= chunk_size:
+            yield "".join(parts)
+            parts = []
+            size = 0
+
+
+def _compile_json_encoder(codec: Codec) -> JSONEncoder:
+    encoders = codec.typers_encoders
+
+    def default(value: Any) -> Any:
+        encoder = encoders.get(type(value))
+        if encoder is None:
+            encoder = codec.compile_encoder(type(value))
+        field_names = getattr(encoder, "field_names", None)
+        if field_names is not None:
+            # only this object's fields, nested values are resolved as they are written
+            return {name: getattr(value, name) for name in field_names}
+        return encoder(value)
+
+    # the C accelerated encoder walks the value and writes into its own buffer,
+    # calling back for anything that is not a JSON primitive
+    return JSONEncoder(
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=default,
+        check_circular=False,
+    )
+
+
+_JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+_JSON_TYPES = (*_JSON_SCALAR_TYPES, list, tuple, dict)
+
+
+def _overrides_json_types(codec: Codec) -> bool:
+    # the C encoder writes JSON types, and instances of their subclasses, itself
+    # without asking their encoders
+    encoders = codec.typers_encoders
+    if (
+        any(
+            encoders.get(cls) is not _BUILTIN_ENCODERS[cls]
+            for cls in _JSON_SCALAR_TYPES
+        )
+        or encoders.get(list) is not codec.encode_list
+        or encoders.get(tuple) is not codec.encode_list
+        or encoders.get(dict) is not codec.encode_dict
+    ):
+        return True
+    # encoders compile_encoder picks for such subclasses agree with the C encoder
+    defaults = (
+        _encode_enum, str, _encode_unchanged, codec.encode_list, codec.encode_dict
+    )
+    return any(
+        cls not in _JSON_TYPES
+        and isinstance(cls, type)
+        and issubclass(cls, _JSON_TYPES)
+        and encoder not in defaults
+        for cls, encoder in list(encoders.items())
+    )
+
+
+def encode_to_str(value: Any, codec: Optional[Codec] = None) -> str:
+    if codec is None:
+        codec = default_codec
+    if codec.encode_cache is not None or _overrides_json_types(codec):
+        # the writer splices the cached text of repeated records and follows
+        # custom encoders for JSON types, which the C encoder cannot do
+        return "".join(iterencode(value, chunk_size=sys.maxsize, codec=codec))
+    json_encoder = codec._text_encoder
+    if json_encoder is None:
+        json_encoder = codec._text_encoder = _compile_json_encoder(codec)
+    try:
+        return cast(str, json_encoder.encode(value))
+    except TypeError:
+        # dict keys such as enums or dates are only converted by the writer
+        return "".join(iterencode(value, chunk_size=sys.maxsize, codec=codec))
+
+
+def encode_to_bytes(value: Any, codec: Optional[Codec] = None) -> bytes:
+    return encode_to_str(value, codec).encode()
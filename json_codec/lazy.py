@@ -0,0 +1,187 @@
+from dataclasses import MISSING, is_dataclass
+from functools import lru_cache
+from typing import Any, Dict, Generic, Iterator, List, Optional, Type, TypeVar
+
+from json_codec.json_codec import (
+    DECODER_CACHE_SIZE,
+    DecoderPlan,
+    LocatedValidationError,
+    LocatedValidationErrorCollection,
+    _DefaultFactory,
+    _Frame,
+    _render_json_path,
+    compile_decoder,
+)
+from json_codec.types import JsonPathSegment
+
+T = TypeVar("T")
+
+_UNDECODED = object()
+
+
+class _LazyPath(_Frame):
+    # only carries the position of a lazy value for error paths
+    __slots__ = ()
+
+    def __init__(self, parent: Optional[_Frame], segment: JsonPathSegment) -> None:
+        self.parent = parent
+        self.segment = segment
+
+
+def _decode_now(
+    plan: DecoderPlan[T], value: Any, parent: Optional[_Frame], segment: JsonPathSegment
+) -> T:
+    errors: List[LocatedValidationError] = []
+    return plan._unwrap(plan.parse(value, parent, segment, errors, False), errors)
+
+
+def _decode_lazily(
+    plan: DecoderPlan[Any],
+    value: Any,
+    parent: Optional[_Frame],
+    segment: JsonPathSegment,
+) -> Any:
+    if is_dataclass(plan.real_type) and type(value) is dict:
+        return LazyRecord(plan, value, parent, segment)
+    if plan.target_type is list and type(value) is list:
+        item_plan = plan.codec.compile_decoder(plan.type_args[0], plan.numeric_arrays)
+        if _is_lazy(item_plan):
+            return LazyList(plan, item_plan, value, parent, segment)
+    # anything else is cheap enough, or needs the checks, to decode right away
+    return _decode_now(plan, value, parent, segment)
+
+
+def _is_lazy(plan: DecoderPlan[Any]) -> bool:
+    if is_dataclass(plan.real_type):
+        return True
+    if plan.target_type is list and len(plan.type_args) == 1:
+        item_type = plan.type_args[0]
+        return _is_lazy(plan.codec.compile_decoder(item_type, plan.numeric_arrays))
+    return False
+
+
+@lru_cache(maxsize=DECODER_CACHE_SIZE)
+def _field_index(plan: DecoderPlan[Any]) -> Dict[str, Any]:
+    record_fields = plan.fields
+    if record_fields is None:
+        record_fields = plan._compile_record()
+    return {field[0]: field for field in record_fields}
+
+
+class LazyRecord(Generic[T]):
+    __slots__ = ("_plan", "_value", "_parent", "_segment", "_fields", "_decoded")
+
+    def __init__(
+        self,
+        plan: DecoderPlan[T],
+        value: Dict[str, Any],
+        parent: Optional[_Frame],
+        segment: JsonPathSegment,
+    ) -> None:
+        self._plan = plan
+        self._value = value
+        self._parent = parent
+        self._segment = segment
+        self._fields: Dict[str, Any] = {}
+        self._decoded: Any = _UNDECODED
+
+    def __getattr__(self, name: str) -> Any:
+        if self._decoded is not _UNDECODED:
+            return getattr(self._decoded, name)
+        try:
+            return self._fields[name]
+        except KeyError:
+            pass
+
+        field = _field_index(self._plan).get(name)
+        if field is None:
+            raise AttributeError(name)
+
+        field_name, field_plan, default, field_path = field
+        if field_name in self._value:
+            result = _decode_lazily(
+                field_plan,
+                self._value[field_name],
+                _LazyPath(self._parent, self._segment),
+                field_path,
+            )
+        elif isinstance(default, _DefaultFactory):
+            result = default.factory()
+        elif default is not MISSING:
+            result = default
+        else:
+            raise LocatedValidationErrorCollection(
+                [
+                    LocatedValidationError(
+                        message="Missing required field: {}".format(field_name),
+                        json_path=_render_json_path(self._parent, self._segment),
+                    )
+                ]
+            )
+
+        self._fields[name] = result
+        return result
+
+    def validate(self) -> T:
+        # decodes and checks every field, later attribute reads use the result
+        if self._decoded is _UNDECODED:
+            self._decoded = _decode_now(
+                self._plan, self._value, self._parent, self._segment
+            )
+        decoded: T = self._decoded
+        return decoded
+
+    def __repr__(self) -> str:
+        return "LazyRecord({})".format(self._plan.real_type.__qualname__)
+
+
+class LazyList(Generic[T]):
+    __slots__ = ("_plan", "_item_plan", "_value", "_path", "_items")
+
+    def __init__(
+        self,
+        plan: DecoderPlan[List[T]],
+        item_plan: DecoderPlan[T],
+        value: List[Any],
+        parent: Optional[_Frame],
+        segment: JsonPathSegment,
+    ) -> None:
+        self._plan = plan
+        self._item_plan = item_plan
+        self._value = value
+        self._path = _LazyPath(parent, segment)
+        self._items: List[Any] = [_UNDECODED] * len(value)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if item is _UNDECODED:
+            if index < 0:
+                index += len(self._items)
+            item = self._items[index] = _decode_lazily(
+                self._item_plan, self._value[index], self._path, index
+            )
+        return item
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self._items)):
+            yield self[index]
+
+    def validate(self) -> List[T]:
+        return _decode_now(
+            self._plan, self._value, self._path.parent, self._path.segment
+        )
+
+    def __repr__(self) -> str:
+        return "LazyList({}, {} items)".format(self._plan.type_, len(self._items))
+
+
+def decode_lazy(value: Any, type_: Type[T], numeric_arrays: Optional[str] = None) -> T:
+    # dataclasses and lists of them come back as proxies that decode each
+    # field or item on first access
+    lazy: T = _decode_lazily(compile_decoder(type_, numeric_arrays), value, None, "$")
+    return lazy
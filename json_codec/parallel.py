@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from json_codec.json_codec import (
+    DecoderPlan,
+    LocatedValidationErrorCollection,
+    compile_decoder,
+)
+from json_codec.types import ValidationErrorBase
+
+T = TypeVar("T")
+
+Document = Union[str, bytes]
+
+# chunks handed to each worker per call, so slow chunks do not hold back the rest
+CHUNKS_PER_WORKER = 4
+
+
+class BatchValidationError(Exception):
+    def __init__(self, errors: Dict[int, Exception]) -> None:
+        super().__init__("Validation failed for %d documents" % len(errors))
+        self.errors = errors
+
+    def __str__(self) -> str:
+        return "\n".join(
+            "[{}] {}".format(index, error) for index, error in self.errors.items()
+        )
+
+
+_worker_plan: Optional[DecoderPlan[Any]] = None
+
+
+def _init_worker(type_: Type[Any], numeric_arrays: Optional[str]) -> None:
+    global _worker_plan
+    _worker_plan = compile_decoder(type_, numeric_arrays)
+
+
+def _decode_documents(
+    plan: DecoderPlan[Any], documents: Sequence[Document]
+) -> List[Tuple[bool, Any]]:
+    results: List[Tuple[bool, Any]] = []
+    for document in documents:
+        try:
+            results.append((True, plan.decode_json(document)))
+        # malformed JSON and values a decoder cannot convert fail just their item
+        except (
+            LocatedValidationErrorCollection,
+            ValidationErrorBase,
+            ValueError,
+            TypeError,
+        ) as e:
+            results.append((False, e))
+    return results
+
+
+def _decode_chunk(documents: Sequence[Document]) -> List[Tuple[bool, Any]]:
+    assert _worker_plan is not None, "Worker was not initialized"
+    return _decode_documents(_worker_plan, documents)
+
+
+def decode_many(
+    documents: Sequence[Document],
+    type_: Type[T],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    numeric_arrays: Optional[str] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    documents = list(documents)
+    if chunksize is None:
+        chunksize = max(1, len(documents) // (workers * CHUNKS_PER_WORKER))
+
+    results: List[Tuple[bool, Any]] = []
+    if workers <= 1 or len(documents) <= chunksize:
+        results = _decode_documents(compile_decoder(type_, numeric_arrays), documents)
+    else:
+        chunks = [
+            documents[start : start + chunksize]
+            for start in range(0, len(documents), chunksize)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(type_, numeric_arrays),
+        ) as executor:
+            for chunk_results in executor.map(_decode_chunk, chunks):
+                results.extend(chunk_results)
+
+    if return_exceptions:
+        return [value for _, value in results]
+
+    errors = {index: value for index, (ok, value) in enumerate(results) if not ok}
+    if errors:
+        raise BatchValidationError(errors)
+    return [value for _, value in results]
@@ -0,0 +1,90 @@
+import re
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+# "[*]" selects every item of a list, tuple or set and every value of a dict
+ITEMS = "[*]"
+
+_PATH_TOKEN = re.compile(r"\[\*\]|[^.\[\]]+")
+
+# a name or "[*]", followed by ".name" or "[*]" segments
+_PATH = re.compile(r"(?:\[\*\]|[^.\[\]]+)(?:\.[^.\[\]]+|\[\*\])*")
+
+
+class _Skipped:
+    def __repr__(self) -> str:
+        return "SKIPPED"
+
+
+# stands in for fields left out by a projection that have no default, typed
+# as Any since it takes the place of values of any type
+SKIPPED: Any = _Skipped()
+
+
+class Projection:
+    def __init__(self, include: Iterable[str] = ()) -> None:
+        # None selects the whole subtree below a name
+        self.fields: Dict[str, Optional[Projection]] = {}
+        for path in include:
+            if _PATH.fullmatch(path) is None:
+                raise ValueError(f"Invalid projection path: {path!r}")
+            self._add(_PATH_TOKEN.findall(path))
+        self._key = self._freeze()
+
+    def _add(self, tokens: Iterable[str]) -> None:
+        node = self
+        tokens = list(tokens)
+        for index, token in enumerate(tokens):
+            if token in node.fields and node.fields[token] is None:
+                return
+            if index == len(tokens) - 1:
+                node.fields[token] = None
+                return
+            child = node.fields.get(token)
+            if child is None:
+                child = node.fields[token] = Projection()
+            node = child
+
+    def _freeze(self) -> FrozenSet[Tuple[str, Optional["Projection"]]]:
+        for child in self.fields.values():
+            if child is not None:
+                child._key = child._freeze()
+        return frozenset(self.fields.items())
+
+    def items(self) -> "Optional[Projection]":
+        # containers pass "[*]" on to their items, a name alone is taken to
+        # mean the same thing
+        if ITEMS in self.fields:
+            return self.fields[ITEMS]
+        return self
+
+    def only(self, names: Iterable[str]) -> "Projection":
+        # the part of the projection that selects the given names
+        projection = Projection()
+        projection.fields = {
+            name: child for name, child in self.fields.items() if name in names
+        }
+        projection._key = frozenset(projection.fields.items())
+        return projection
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.fields
+
+    def __getitem__(self, name: str) -> "Optional[Projection]":
+        return self.fields[name]
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Projection) and self._key == other._key
+
+    def __repr__(self) -> str:
+        return "Projection({})".format(sorted(self._paths()))
+
+    def _paths(self) -> Iterable[str]:
+        for name, child in self.fields.items():
+            if child is None:
+                yield name
+            else:
+                for path in child._paths():
+                    yield name + ("" if path.startswith("[") else ".") + path
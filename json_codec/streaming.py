@@ -0,0 +1,224 @@
+import codecs
+import gzip
+import io
+import json
+from decimal import Decimal
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from json_codec.json_codec import (
+    DecoderPlan,
+    JsonDumps,
+    JsonLoads,
+    compile_decoder,
+    encode,
+    json_dumps,
+)
+
+T = TypeVar("T")
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+NDJSON_BATCH_SIZE = 1000
+
+_json_decoder = json.JSONDecoder()
+_decimal_json_decoder = json.JSONDecoder(parse_float=Decimal)
+
+_WHITESPACE = " \t\n\r"
+
+
+class SupportsRead(Protocol):
+    # text or binary files, including gzip.GzipFile
+    def read(self, size: int = ...) -> Any:
+        ...
+
+
+def _iter_text_chunks(fp: SupportsRead, chunk_size: int) -> Iterator[str]:
+    decoder: Optional[codecs.IncrementalDecoder] = None
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, (bytes, bytearray)):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+            chunk = decoder.decode(chunk)
+        yield chunk
+
+    if decoder is not None:
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+def _read_more(buffer: str, chunks: Iterator[str]) -> Optional[str]:
+    # reads at least as much as is already buffered, so a value spanning many
+    # chunks is re-scanned a logarithmic number of times
+    pieces = [buffer]
+    read = 0
+    for chunk in chunks:
+        pieces.append(chunk)
+        read += len(chunk)
+        if read >= len(buffer):
+            break
+    if not read:
+        return None
+    return "".join(pieces)
+
+
+def _iter_lines(
+    plan: DecoderPlan[T],
+    buffer: str,
+    chunks: Iterator[str],
+    loads: Optional[JsonLoads],
+) -> Iterator[T]:
+    while True:
+        lines = buffer.split("\n")
+        buffer = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield plan.decode_json(line, loads)
+
+        more = _read_more(buffer, chunks)
+        if more is None:
+            break
+        buffer = more
+
+    if buffer.strip():
+        yield plan.decode_json(buffer, loads)
+
+
+def _iter_array_items(
+    plan: DecoderPlan[T], buffer: str, chunks: Iterator[str]
+) -> Iterator[T]:
+    decoder = _decimal_json_decoder if plan.parses_decimals else _json_decoder
+    position = 1  # skips the opening bracket
+    expects_item = True
+    is_empty = True
+    exhausted = False
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+
+        if position == len(buffer):
+            if exhausted:
+                raise ValueError("Unterminated JSON array")
+            more = _read_more(buffer[position:], chunks)
+            exhausted = more is None
+            buffer, position = more or "", 0
+            continue
+
+        char = buffer[position]
+        if not expects_item:
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at {char!r}")
+            position += 1
+            expects_item = True
+            continue
+
+        if char == "]" and is_empty:
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if exhausted:
+                raise
+            end = len(buffer)
+
+        # a value touching the end of the buffer may continue in the next chunk
+        if end == len(buffer) and not exhausted:
+            more = _read_more(buffer[position:], chunks)
+            exhausted = more is None
+            if more is not None:
+                buffer, position = more, 0
+            continue
+
+        yield plan.decode(value)
+        position = end
+        expects_item = False
+        is_empty = False
+
+
+def iter_decode(
+    fp: SupportsRead,
+    type_: Type[T],
+    loads: Optional[JsonLoads] = None,
+    numeric_arrays: Optional[str] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    format: Optional[str] = None,
+) -> Iterator[T]:
+    if format not in (None, "ndjson", "array"):
+        raise ValueError(f"Unsupported stream format: {format}")
+
+    plan = compile_decoder(type_, numeric_arrays)
+    chunks = _iter_text_chunks(fp, chunk_size)
+
+    buffer = ""
+    for chunk in chunks:
+        buffer = chunk.lstrip()
+        if buffer:
+            break
+
+    if format is None:
+        # a NDJSON stream of arrays must be read with format="ndjson"
+        format = "array" if buffer.startswith("[") else "ndjson"
+
+    if format == "array":
+        if not buffer.startswith("["):
+            raise ValueError("Expected a JSON array")
+        return _iter_array_items(plan, buffer, chunks)
+    return _iter_lines(plan, buffer, chunks, loads)
+
+
+def write_ndjson(
+    fp: IO[Any],
+    values: Iterable[Any],
+    dumps: Optional[JsonDumps] = None,
+    batch_size: int = NDJSON_BATCH_SIZE,
+    compress: bool = False,
+) -> int:
+    if dumps is None:
+        dumps = json_dumps
+
+    output: Union[IO[Any], gzip.GzipFile] = fp
+    if compress:
+        output = gzip.GzipFile(fileobj=fp, mode="wb")
+    is_text = isinstance(output, io.TextIOBase)
+
+    count = 0
+    batch: List[bytes] = []
+    try:
+        for value in values:
+            batch.append(dumps(encode(value)))
+            count += 1
+            if len(batch) >= batch_size:
+                _write_batch(output.write, batch, is_text)
+                batch = []
+        if batch:
+            _write_batch(output.write, batch, is_text)
+    finally:
+        if compress:
+            output.close()
+
+    return count
+
+
+def _write_batch(
+    write: Callable[[Any], object], batch: List[bytes], is_text: bool
+) -> None:
+    data = b"\n".join(batch) + b"\n"
+    write(data.decode() if is_text else data)
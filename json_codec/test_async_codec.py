@@ -0,0 +1,95 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, List
+
+import pytest
+
+from json_codec.async_codec import aiter_decode, decode_async
+from json_codec.json_codec import LocatedValidationErrorCollection
+
+
+@dataclass
+class Item:
+    id: int
+    children: List["Item"]
+
+
+Item.__dataclass_fields__["children"].type = List[Item]
+
+
+@dataclass
+class Flat:
+    a: int
+    b: str
+
+
+DOCUMENT = {"id": 0, "children": [{"id": i, "children": []} for i in range(100)]}
+
+
+class TestAsyncCodec:
+    def test_decode_async_yields_to_loop(self) -> None:
+        ticks: List[None] = []
+
+        async def ticker() -> None:
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def main() -> Item:
+            task = asyncio.ensure_future(ticker())
+            try:
+                return await decode_async(DOCUMENT, Item, budget=10)
+            finally:
+                task.cancel()
+
+        parsed = asyncio.run(main())
+
+        assert len(parsed.children) == 100
+        assert len(ticks) >= 10
+
+    def test_decode_async_yields_within_flat_lists(self) -> None:
+        ticks: List[None] = []
+
+        async def ticker() -> None:
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def main() -> List[Flat]:
+            task = asyncio.ensure_future(ticker())
+            try:
+                records = [{"a": i, "b": str(i)} for i in range(1000)]
+                return await decode_async(records, List[Flat], budget=10)
+            finally:
+                task.cancel()
+
+        parsed = asyncio.run(main())
+
+        assert parsed[-1] == Flat(999, "999")
+        assert len(ticks) >= 50
+
+    def test_decode_async_errors(self) -> None:
+        with pytest.raises(LocatedValidationErrorCollection):
+            asyncio.run(decode_async({"id": "x", "children": []}, Item))
+
+    def test_aiter_decode(self) -> None:
+        async def stream() -> AsyncIterator[bytes]:
+            yield b'{"id": 1, "children": []}\n{"id": 2,'
+            yield b' "children": []}\n\n{"id": 3, "children": []}'
+
+        async def main() -> List[Item]:
+            return [item async for item in aiter_decode(stream(), Item)]
+
+        assert [item.id for item in asyncio.run(main())] == [1, 2, 3]
+
+    def test_aiter_decode_lines_spanning_many_chunks(self) -> None:
+        document = b'{"id": 1, "children": []}\n{"id": 2, "children": []}\n'
+
+        async def stream() -> AsyncIterator[str]:
+            for index in range(len(document)):
+                yield document[index : index + 1].decode()
+
+        async def main() -> List[Item]:
+            return [item async for item in aiter_decode(stream(), Item)]
+
+        assert [item.id for item in asyncio.run(main())] == [1, 2]
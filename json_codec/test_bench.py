@@ -0,0 +1,35 @@
+from json_codec.bench import WORKLOADS, build_workloads, compare, run
+
+
+class TestBench:
+    def test_workloads_are_reproducible(self) -> None:
+        first = build_workloads(seed=3, scale=2)
+        second = build_workloads(seed=3, scale=2, names=["datetimes"])
+
+        assert [workload.name for workload in first] == list(WORKLOADS)
+        assert first[list(WORKLOADS).index("datetimes")].value == second[0].value
+        assert build_workloads(seed=4, scale=2)[0].value != first[0].value
+
+    def test_runs_every_operation(self) -> None:
+        results = run(build_workloads(scale=1), repeat=1)
+
+        assert len(results) == 4 * len(WORKLOADS)
+        assert all(
+            result["seconds"] >= 0 and result["peak_bytes"] > 0
+            for result in results.values()
+        )
+
+    def test_compare_reports_regressions(self) -> None:
+        baseline = {
+            "a.decode": {"seconds": 1.0, "peak_bytes": 100},
+            "b.decode": {"seconds": 1.0, "peak_bytes": 100},
+        }
+        results = {
+            "a.decode": {"seconds": 1.05, "peak_bytes": 100},
+            "b.decode": {"seconds": 1.0, "peak_bytes": 150},
+            "c.decode": {"seconds": 9.0, "peak_bytes": 900},
+        }
+
+        regressions = compare(results, baseline, tolerance=0.1)
+
+        assert regressions == ["b.decode peak_bytes: 100 -> 150 (+50.0%)"]
@@ -0,0 +1,116 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from json_codec.encode_cache import EncodeCache
+from json_codec.json_codec import Codec
+from json_codec.json_text import encode_to_bytes, encode_to_str, iterencode
+
+
+@dataclass(frozen=True)
+class Currency:
+    code: str
+    digits: int
+
+
+@dataclass(frozen=True)
+class Tagged:
+    code: str
+    tags: List[str]
+
+
+@dataclass(frozen=True)
+class Money:
+    amount: float
+    note: str = field(default="a", compare=False)
+
+
+@dataclass(frozen=True)
+class Amount:
+    value: float
+
+
+@dataclass
+class Price:
+    amount: int
+    currency: Currency
+
+
+EUR = Currency("EUR", 2)
+PRICES = [Price(1, EUR), Price(2, EUR), Price(3, Currency("USD", 2))]
+
+
+class TestEncodeCache:
+    def test_encodes_repeated_records_once(self) -> None:
+        codec = Codec()
+        cache = EncodeCache()
+        expected = codec.encode(PRICES)
+        codec.use_encode_cache(cache)
+
+        assert codec.encode(PRICES) == expected
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_text_encoders_splice_cached_text(self) -> None:
+        codec = Codec()
+        expected = encode_to_str(PRICES, codec)
+        cache = EncodeCache()
+        codec.use_encode_cache(cache)
+
+        assert encode_to_str(PRICES, codec) == expected
+        assert encode_to_bytes(PRICES, codec) == expected.encode()
+        assert "".join(iterencode(PRICES, chunk_size=8, codec=codec)) == expected
+        assert cache.hits >= 4
+
+    def test_equal_records_are_encoded_on_their_own(self) -> None:
+        codec = Codec()
+        codec.use_encode_cache(EncodeCache())
+
+        assert codec.encode(Money(1)) == {"amount": 1, "note": "a"}
+        assert codec.encode(Money(1.0, note="b")) == {"amount": 1.0, "note": "b"}
+        assert encode_to_str(Money(1), codec) == '{"amount":1,"note":"a"}'
+        assert encode_to_str(Money(1.0, "b"), codec) == '{"amount":1.0,"note":"b"}'
+        encoded = codec.encode([Amount(1), Amount(1.0)])
+        assert [type(amount["value"]) for amount in encoded] == [int, float]
+        assert encode_to_str([Amount(1), Amount(1.0)], codec) == (
+            '[{"value":1},{"value":1.0}]'
+        )
+
+    def test_hits_share_the_cached_dict(self) -> None:
+        codec = Codec()
+        codec.use_encode_cache(EncodeCache())
+
+        encoded = codec.encode(EUR)
+
+        assert encoded == {"code": "EUR", "digits": 2}
+        assert codec.encode(EUR) is encoded
+        assert codec.encode(Currency("EUR", 2)) is not encoded
+
+    def test_evicts_least_recently_used(self) -> None:
+        codec = Codec()
+        cache = EncodeCache(max_size=1)
+        codec.use_encode_cache(cache)
+
+        codec.encode(EUR)
+        codec.encode(Currency("USD", 2))
+        codec.encode(EUR)
+
+        assert (cache.hits, cache.misses, len(cache)) == (0, 3, 1)
+
+    def test_unhashable_records_are_encoded_every_time(self) -> None:
+        codec = Codec()
+        cache = EncodeCache()
+        codec.use_encode_cache(cache)
+
+        assert codec.encode(Tagged("a", ["x"])) == {"code": "a", "tags": ["x"]}
+        assert len(cache) == 0
+
+    def test_disabling_recompiles_encoders(self) -> None:
+        codec = Codec()
+        cache = EncodeCache()
+        codec.use_encode_cache(cache)
+        codec.encode(EUR)
+        codec.use_encode_cache(None)
+        cache.clear()
+
+        codec.encode(EUR)
+
+        assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+import pytest
+
+from json_codec.instrumentation import DecodeStats
+from json_codec.json_codec import Codec, LocatedValidationErrorCollection
+
+
+@dataclass
+class Line:
+    sku: str
+    at: datetime
+
+
+@dataclass
+class Invoice:
+    id: int
+    lines: List[Line]
+
+
+@dataclass
+class Comment:
+    text: str
+    reply: Optional["Comment"]
+
+
+Comment.__dataclass_fields__["reply"].type = Optional[Comment]
+
+DOCUMENT = {
+    "id": 1,
+    "lines": [{"sku": "a", "at": "2020-01-01T00:00:00+00:00"}] * 3,
+}
+
+
+class TestInstrumentation:
+    def test_counts_calls_per_type(self) -> None:
+        codec = Codec()
+        stats = DecodeStats()
+        codec.instrument(stats)
+
+        codec.decode(DOCUMENT, Invoice)
+        snapshot = stats.snapshot()
+
+        assert snapshot.types[Invoice].calls == 1
+        assert snapshot.types[List[Line]].calls == 1
+        assert snapshot.types[Line].calls == 3
+        assert snapshot.types[datetime].calls == 3
+        assert snapshot.types[int].calls == 1
+        invoice = snapshot.types[Invoice]
+        assert invoice.total_time >= invoice.own_time > 0
+
+    def test_counts_errors_where_they_happen(self) -> None:
+        codec = Codec()
+        stats = DecodeStats()
+        codec.instrument(stats)
+
+        with pytest.raises(LocatedValidationErrorCollection):
+            codec.decode({"id": 1, "lines": [{"sku": "a", "at": "never"}]}, Invoice)
+        types = stats.snapshot().types
+
+        assert types[datetime].errors == 1
+        assert types[Line].errors == 0
+        assert types[Invoice].errors == 0
+
+    def test_deep_documents_decode_with_stats(self) -> None:
+        codec = Codec()
+        stats = DecodeStats()
+        codec.instrument(stats)
+        thread: Any = None
+        for index in range(3000):
+            thread = {"text": str(index), "reply": thread}
+
+        comment = codec.decode(thread, Comment)
+
+        assert comment.text == "2999"
+        assert stats.snapshot().types[Comment].calls == 3000
+
+    def test_keeps_slowest_paths(self) -> None:
+        codec = Codec()
+        stats = DecodeStats(slowest=2)
+        codec.instrument(stats)
+
+        codec.decode(DOCUMENT, Invoice)
+        slowest = stats.snapshot().slowest
+
+        assert len(slowest) == 2
+        assert slowest[0].own_time >= slowest[1].own_time
+        assert all(path.json_path.startswith("$") for path in slowest)
+
+    def test_reset_and_hook(self) -> None:
+        calls: List[Tuple[Any, float, bool]] = []
+        codec = Codec()
+        stats = DecodeStats(hook=lambda *call: calls.append(call))
+        codec.instrument(stats)
+
+        codec.decode("x", str)
+        stats.reset()
+
+        assert calls[0][0] is str and calls[0][2] is False
+        assert stats.snapshot().types == {}
+
+    def test_disabling_compiles_plain_plans(self) -> None:
+        codec = Codec()
+        stats = DecodeStats()
+        codec.instrument(stats)
+        codec.instrument(None)
+
+        assert codec.decode(DOCUMENT, Invoice).id == 1
+        assert stats.snapshot().types == {}
+        assert codec.compile_decoder(Line).leaf is None
+        assert codec.compile_decoder(str).leaf is not None
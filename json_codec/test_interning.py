@@ -0,0 +1,106 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple
+
+from json_codec.interning import Interner
+from json_codec.json_codec import decode, decode_str
+
+
+@dataclass(frozen=True)
+class Currency:
+    code: str
+    digits: int
+
+
+class Origin(NamedTuple):
+    country: str
+    region: str
+
+
+@dataclass(frozen=True)
+class Tag:
+    value: Any
+
+
+@dataclass(frozen=True)
+class Label:
+    code: str
+    text: str = field(compare=False)
+
+
+@dataclass
+class Product:
+    sku: str
+    currency: Currency
+    origin: Origin
+    tags: List[str]
+
+
+def _products(count: int) -> List[Dict[str, object]]:
+    return [
+        {
+            "sku": "sku-{}".format(index),
+            "currency": {"code": "".join(["E", "U", "R"]), "digits": 2},
+            "origin": ["BR", "south"],
+            "tags": ["".join(["sa", "le"])],
+        }
+        for index in range(count)
+    ]
+
+
+class TestInterning:
+    def test_shares_equal_values_within_a_call(self) -> None:
+        first, second = decode(_products(2), List[Product], intern=True)
+
+        assert first.currency is second.currency
+        assert first.origin is second.origin
+        assert first.tags[0] is second.tags[0]
+        assert first.currency.code is second.currency.code
+
+    def test_off_by_default(self) -> None:
+        first, second = decode(_products(2), List[Product])
+
+        assert first.currency == second.currency
+        assert first.currency is not second.currency
+
+    def test_shared_interner_spans_calls(self) -> None:
+        interner = Interner()
+        text = '{"code": "EUR", "digits": 2}'
+
+        first = decode_str(text, Currency, intern=interner)
+        second = decode_str(text, Currency, intern=interner)
+
+        assert first is second
+        assert interner.hits > 0
+
+    def test_bounded_tables(self) -> None:
+        interner = Interner(max_size=1)
+
+        assert interner.string("a") == "a"
+        assert interner.string("b") == "b"
+        assert list(interner.strings) == ["a"]
+
+    def test_unhashable_records_are_kept(self) -> None:
+        interner = Interner()
+        value = Origin(["BR"], "south")  # type: ignore
+
+        assert interner.record(value) is value
+        assert interner.records == {}
+
+    def test_equal_records_holding_other_values_are_kept_apart(self) -> None:
+        interned = decode(
+            {"first": {"value": 1}, "second": {"value": True}},
+            Dict[str, Tag],
+            intern=True,
+        )
+
+        assert type(interned["first"].value) is int
+        assert interned["second"].value is True
+
+    def test_records_with_uncompared_fields_are_not_interned(self) -> None:
+        first, second = decode(
+            [{"code": "a", "text": "x"}, {"code": "a", "text": "y"}],
+            List[Label],
+            intern=True,
+        )
+
+        assert (first.text, second.text) == ("x", "y")
@@ -1,19 +1,32 @@
 import base64
 import json
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date, datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Dict, List, NewType, Optional, Union
+from typing import Any, Dict, List, NamedTuple, NewType, Optional, Set, Tuple, Union
 
 import pytest
+from typing_extensions import Literal, Required, TypedDict
 
+from json_codec.codecs.datetime_codec import DateTimeTypeDecoder
 from json_codec.json_codec import (
+    Codec,
     LocatedValidationErrorCollection,
+    compile_decoder,
     decode,
+    decode_bytes,
+    decode_str,
+    default_codec,
     encode,
     optional,
+    typers_parsers,
 )
+from json_codec.json_text import encode_to_str
+from json_codec.types import LeafTypeDecoder, ValidationError
 from json_codec.utils import get_class_or_type_name
 
 
@@ -369,3 +382,612 @@ class TestJsonDeserializerCodec:
         parsed = decode(dummy_json, Dummy)
 
         assert parsed.bytes_ == hello_bytes
+
+    def test_compile_decoder_is_cached(self) -> None:
+        @dataclass
+        class Order:
+            id: int
+            tags: List[str]
+
+        decoder = compile_decoder(List[Order])
+
+        assert compile_decoder(List[Order]) is decoder
+        assert decoder.decode([{"id": 1, "tags": ["a"]}]) == [Order(1, ["a"])]
+        assert decode([{"id": 2, "tags": []}], List[Order]) == [Order(2, [])]
+        assert default_codec.cache_info().maxsize is not None
+
+    def test_compile_decoder_recursive_dataclass(self) -> None:
+        @dataclass
+        class Node:
+            name: str
+            children: List["Node"]
+
+        Node.__dataclass_fields__["children"].type = List[Node]
+
+        parsed = decode(
+            {"name": "a", "children": [{"name": "b", "children": []}]}, Node
+        )
+
+        assert parsed == Node("a", [Node("b", [])])
+
+    def test_encode_nested_dataclass(self) -> None:
+        class Status(str, Enum):
+            ACTIVE = "active"
+
+        @dataclass
+        class Item:
+            sku: str
+            price: Decimal
+
+        @dataclass
+        class Order:
+            status: Status
+            items: List[Item]
+            created_at: date
+            meta: Dict[str, Optional[int]]
+
+        order = Order(
+            status=Status.ACTIVE,
+            items=[Item("a", Decimal("1.5"))],
+            created_at=date(2020, 1, 1),
+            meta={"count": None},
+        )
+
+        assert encode(order) == {
+            "status": "active",
+            "items": [{"sku": "a", "price": "1.5"}],
+            "created_at": "2020-01-01",
+            "meta": {"count": None},
+        }
+        assert encode([order, order])[1] == encode(order)
+
+    def test_codec_registries_are_isolated(self) -> None:
+        class Cents(LeafTypeDecoder[int]):
+            def decode(self, value: Any) -> Any:
+                if not isinstance(value, str) or not value.endswith("c"):
+                    return ValidationError(f"Expected cents, but '{value}' is not")
+                return int(value[:-1])
+
+        @dataclass
+        class Price:
+            amount: int
+            paid_at: date
+
+        codec = Codec()
+        codec.register_decoder(int, Cents())
+        codec.register_encoder(date, lambda value: value.toordinal())
+
+        assert codec.decode({"amount": "150c", "paid_at": "2020-01-01"}, Price) == (
+            Price(150, date(2020, 1, 1))
+        )
+        assert codec.decode(["1c", "2c"], List[int]) == [1, 2]
+        assert codec.encode([date(2020, 1, 1)]) == [737425]
+        assert decode({"amount": 150, "paid_at": "2020-01-01"}, Price).amount == 150
+        assert encode([date(2020, 1, 1)]) == ["2020-01-01"]
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            codec.decode({"amount": 150, "paid_at": "2020-01-01"}, Price)
+
+        assert e.value.errors[0].json_path == "$.amount"
+
+    def test_codec_shared_across_threads(self) -> None:
+        @dataclass
+        class Row:
+            id: int
+            tags: List[str]
+
+        codec = Codec()
+
+        def decode_row(index: int) -> Any:
+            if index % 2:
+                return codec.decode({"id": index, "tags": ["a"]}, Row)
+            with pytest.raises(LocatedValidationErrorCollection) as e:
+                codec.decode({"id": "x", "tags": [index]}, Row)
+            return e.value.errors
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(decode_row, range(200)))
+
+        for index, result in enumerate(results):
+            if index % 2:
+                assert result == Row(index, ["a"])
+            else:
+                assert [error.json_path for error in result] == ["$.id"]
+
+    def test_leaf_decoder(self) -> None:
+        decoder = typers_parsers[int]
+
+        assert isinstance(decoder, LeafTypeDecoder)
+        assert decoder.decode("1") == 1
+        assert isinstance(decoder.decode("a"), ValidationError)
+        assert decode(["2020-01-01"], List[date]) == [date(2020, 1, 1)]
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode({"a": "b"}, Dict[str, int])
+
+        assert e.value.errors[0].json_path == "$['a'] (value)"
+
+    def test_decode_deeply_nested(self) -> None:
+        @dataclass
+        class Comment:
+            text: str
+            replies: List["Comment"]
+
+        Comment.__dataclass_fields__["replies"].type = List[Comment]
+
+        depth = sys.getrecursionlimit() * 2
+        document: Dict[str, Any] = {"text": "leaf", "replies": []}
+        for index in range(depth):
+            document = {"text": str(index), "replies": [document]}
+
+        parsed = decode(document, Comment)
+
+        for _ in range(depth):
+            parsed = parsed.replies[0]
+        assert parsed.text == "leaf"
+
+    def test_error_json_paths(self) -> None:
+        @dataclass
+        class Item:
+            sku: str
+            quantity: int
+
+        @dataclass
+        class Order:
+            items: List[Item]
+            meta: Dict[str, int]
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode(
+                {
+                    "items": [
+                        {"sku": "a", "quantity": "1"},
+                        {"sku": "b", "quantity": "x"},
+                    ],
+                    "meta": {"count": "y"},
+                },
+                Order,
+            )
+
+        assert [error.json_path for error in e.value.errors] == [
+            "$.items[1].quantity",
+            "$.meta['count'] (value)",
+        ]
+
+    def test_decode_set(self) -> None:
+        assert decode(["a", "b", "a"], Set[str]) == {"a", "b"}
+
+    def test_decode_primitive_lists(self) -> None:
+        @dataclass
+        class Telemetry:
+            samples: List[float]
+            counters: List[int]
+            tags: Set[str]
+
+        document = {"samples": [1, 2.5, "3"], "counters": [1, 2], "tags": ["a"]}
+
+        parsed = decode(document, Telemetry)
+
+        assert parsed == Telemetry([1.0, 2.5, 3.0], [1, 2], {"a"})
+        assert type(parsed.samples) is list
+
+        with pytest.raises(ValidationError):
+            decode({**document, "counters": [1, "x"]}, Telemetry)
+
+    def test_decode_numeric_arrays(self) -> None:
+        @dataclass
+        class Telemetry:
+            samples: List[float]
+            counters: List[int]
+            names: List[str]
+
+        document = {"samples": [1, 2.5], "counters": [1, 2], "names": ["a"]}
+
+        parsed = decode(document, Telemetry, numeric_arrays="array")
+
+        assert parsed.samples == array("d", [1.0, 2.5])
+        assert parsed.counters == array("q", [1, 2])
+        assert parsed.names == ["a"]
+        assert decode([2**70], List[int], numeric_arrays="array") == [2**70]
+
+    def test_numeric_arrays_round_trip(self) -> None:
+        @dataclass
+        class Telemetry:
+            samples: List[float]
+            counters: List[int]
+
+        document = {"samples": [1.0, 2.5], "counters": [1, 2]}
+
+        parsed = decode(document, Telemetry, numeric_arrays="array")
+
+        assert encode(parsed) == document
+        assert encode_to_str(parsed) == '{"samples":[1.0,2.5],"counters":[1,2]}'
+
+    def test_decode_bytes_and_str(self) -> None:
+        @dataclass
+        class Payment:
+            amount: Decimal
+            rate: float
+            reference: Optional[str]
+
+        payload = '{"amount": 1.1, "rate": 0.5, "reference": null}'
+
+        parsed = decode_str(payload, Payment)
+
+        assert parsed == Payment(Decimal("1.1"), 0.5, None)
+        assert type(parsed.rate) is float
+        assert decode_bytes(payload.encode(), Payment) == parsed
+        assert decode_bytes(b"[1, 2]", List[int]) == [1, 2]
+        assert decode_str("[1]", List[int], loads=lambda text: [2]) == [2]
+
+    def test_decode_str_keeps_floats_under_any(self) -> None:
+        @dataclass
+        class Priced:
+            price: Decimal
+            meta: Dict[str, Any]
+
+        payload = '{"price": 1.5, "meta": {"x": 0.1}}'
+
+        parsed = decode_str(payload, Priced)
+
+        assert parsed == decode(json.loads(payload), Priced)
+        assert type(parsed.meta["x"]) is float
+
+    def test_decode_str_keeps_floats_in_unions(self) -> None:
+        @dataclass
+        class Measure:
+            price: Decimal
+            value: Union[int, float]
+            limit: Optional[float]
+
+        payload = '{"price": 1.5, "value": 2.5, "limit": 0.1}'
+
+        parsed = decode_str(payload, Measure)
+
+        assert parsed == Measure(Decimal("1.5"), 2.5, 0.1)
+        assert type(parsed.value) is float
+
+    def test_discriminated_union(self) -> None:
+        @dataclass
+        class Clicked:
+            type: Literal["click"]
+            x: int
+
+        @dataclass
+        class Scrolled:
+            type: Literal["scroll", "wheel"]
+            delta: float
+
+        @dataclass
+        class Heartbeat:
+            at: date
+
+        Event: Any = Union[Clicked, Scrolled, Heartbeat]
+
+        assert decode(
+            [
+                {"type": "wheel", "delta": 1.5},
+                {"type": "click", "x": 1},
+                {"at": "2020-01-01"},
+            ],
+            List[Event],
+        ) == [Scrolled("wheel", 1.5), Clicked("click", 1), Heartbeat(date(2020, 1, 1))]
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode({"type": "scroll", "delta": "fast"}, Event)
+
+        assert [error.json_path for error in e.value.errors] == ["$.delta"]
+
+        Tagged: Any = Union[Clicked, Scrolled]
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode({"type": "drag"}, Tagged)
+
+        assert "Field 'type'" in e.value.errors[0].message
+
+    def test_union_dispatch_by_json_type(self) -> None:
+        @dataclass
+        class Point:
+            x: int
+
+        Value: Any = Union[Point, List[int], Literal["none"], int]
+
+        assert decode({"x": 1}, Value) == Point(1)
+        assert decode([1, 2], Value) == [1, 2]
+        assert decode("none", Value) == "none"
+        assert decode("3", Value) == 3
+
+        none: Any = Literal["none"]
+        one: Any = Literal[1]
+
+        with pytest.raises(LocatedValidationErrorCollection):
+            decode("x", none)
+        with pytest.raises(LocatedValidationErrorCollection):
+            decode(True, one)
+
+    def test_untagged_dataclass_union(self) -> None:
+        @dataclass
+        class Moved:
+            x: int
+            y: int
+
+        @dataclass
+        class Renamed:
+            name: str
+
+        @dataclass
+        class Resized:
+            x: str
+
+        Event: Any = Union[Moved, Renamed, Resized]
+
+        assert decode({"name": "a"}, Event) == Renamed("a")
+        assert decode({"x": "wide"}, Event) == Resized("wide")
+        assert decode([{"x": 1, "y": 2}, {"x": "1"}], List[Event]) == [
+            Moved(1, 2),
+            Resized("1"),
+        ]
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode({"y": 1}, Event)
+
+        # reported for the member sharing the most fields with the object
+        assert [error.message for error in e.value.errors] == [
+            "Missing required field: x"
+        ]
+        assert [error.json_path for error in e.value.errors] == ["$"]
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode("y", Event)
+
+        assert "does not match any of the union types" in e.value.errors[0].message
+
+    def test_optional_dataclass_reports_its_errors(self) -> None:
+        @dataclass
+        class Point:
+            x: int
+
+        @dataclass
+        class Shape:
+            a: Optional[Point]
+
+        assert decode({"a": None}, Shape) == Shape(None)
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode({"a": {"x": "left"}}, Shape)
+
+        assert [error.json_path for error in e.value.errors] == ["$.a.x"]
+
+        with pytest.raises(LocatedValidationErrorCollection):
+            decode({"a": {}}, Shape)
+
+    def test_tagged_union_with_default_tag(self) -> None:
+        @dataclass
+        class Circle:
+            x: int
+            kind: Literal["circle"] = "circle"
+
+        @dataclass
+        class Square:
+            side: int
+            kind: Literal["square"]
+
+        Shape: Any = Union[Circle, Square]
+
+        assert decode({"x": 1}, Shape) == Circle(x=1, kind="circle")
+        assert decode({"kind": "square", "side": 2}, Shape) == Square(2, "square")
+
+        with pytest.raises(LocatedValidationErrorCollection):
+            decode({"side": 2}, Shape)
+
+    def test_iso8601_formats(self) -> None:
+        tz = timezone(timedelta(hours=-1, minutes=-30))
+
+        assert decode("2020-01-01T10:20:30Z", datetime) == datetime(
+            2020, 1, 1, 10, 20, 30, tzinfo=timezone.utc
+        )
+        assert decode("2020-01-01T10:20:30.5-01:30", datetime) == datetime(
+            2020, 1, 1, 10, 20, 30, 500000, tzinfo=tz
+        )
+        assert decode("2020-01-01T10:20:30.1234567-0130", datetime) == datetime(
+            2020, 1, 1, 10, 20, 30, 123456, tzinfo=tz
+        )
+        assert decode("10:20:30.25", time) == time(10, 20, 30, 250000)
+        assert decode("2020-1-2", date) == date(2020, 1, 2)
+
+        value = datetime(2020, 1, 1, 10, 20, 30, 5, tzinfo=tz)
+        assert encode([value, value.date(), value.time()]) == [
+            value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "2020-01-01",
+            "10:20:30",
+        ]
+
+    def test_memoized_datetime_decoder(self) -> None:
+        codec = Codec()
+        codec.register_decoder(datetime, DateTimeTypeDecoder(cache_size=16))
+
+        first, second = codec.decode(["2020-01-01T00:00:00Z"] * 2, List[datetime])
+
+        assert first is second
+        with pytest.raises(LocatedValidationErrorCollection):
+            codec.decode("2020-01-01", datetime)
+
+    def test_enum_lookup(self) -> None:
+        class Status(Enum):
+            ACTIVE = "active"
+            ENABLED = "active"
+            INACTIVE = "inactive"
+
+            @classmethod
+            def _missing_(cls, value: Any) -> Any:
+                return cls.INACTIVE if value == "disabled" else None
+
+        class Weekday(Enum):
+            MONDAY = 1
+            TUESDAY = 2
+
+        assert decode(["active", "disabled"], List[Status]) == [
+            Status.ACTIVE,
+            Status.INACTIVE,
+        ]
+        assert decode(2, Weekday) is Weekday.TUESDAY
+        assert encode({"days": [Weekday.MONDAY], "status": Status.ENABLED}) == {
+            "days": [1],
+            "status": "active",
+        }
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode([3], Weekday)
+
+        assert e.value.errors[0].message == (
+            f"Invalid enum value for {Weekday}: [3] | valid types: MONDAY, TUESDAY"
+        )
+
+    def test_dataclass_construction(self) -> None:
+        @dataclass(frozen=True)
+        class Point:
+            x: int
+            y: int = 0
+
+        @dataclass
+        class Scaled:
+            point: Point
+            factor: float
+
+            def __post_init__(self) -> None:
+                self.factor = abs(self.factor)
+
+        class Checked:
+            def __set_name__(self, owner: Any, name: str) -> None:
+                self.name = "_" + name
+
+            def __get__(self, instance: Any, owner: Any) -> Any:
+                return getattr(instance, self.name, 0)
+
+            def __set__(self, instance: Any, value: int) -> None:
+                assert value >= 0, "must not be negative"
+                setattr(instance, self.name, value)
+
+        @dataclass
+        class Counter:
+            count: int = Checked()  # type: ignore
+
+        parsed = decode({"point": {"x": 1}, "factor": -2}, Scaled)
+
+        assert parsed == Scaled(Point(1, 0), 2.0)
+        assert hash(parsed.point) == hash(Point(1, 0))
+        assert decode({"count": 3}, Counter).count == 3
+
+        with pytest.raises(LocatedValidationErrorCollection):
+            decode({"count": -1}, Counter)
+
+    def test_dataclass_with_own_init(self) -> None:
+        @dataclass(init=False)
+        class Range:
+            low: int
+            high: int
+
+            def __init__(self, high: int, low: int) -> None:
+                self.low = low
+                self.high = high
+
+        @dataclass
+        class Size:
+            width: int
+            height: int
+
+        class Square(Size):
+            def __init__(self, *, height: int, width: int) -> None:
+                super().__init__(width, height)
+
+        assert decode({"low": 1, "high": 2}, Range) == Range(high=2, low=1)
+        assert decode({"width": 1, "height": 2}, Square) == Square(width=1, height=2)
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="slots and kw_only")
+    def test_dataclass_slots_and_keyword_only(self) -> None:
+        @dataclass(slots=True)  # type: ignore
+        class Slotted:
+            name: str
+            size: int = 1
+
+        @dataclass(kw_only=True)  # type: ignore
+        class Options:
+            verbose: bool
+            level: int = 0
+
+        assert decode([{"name": "a"}], List[Slotted]) == [Slotted("a", 1)]
+        assert decode({"level": 2, "verbose": True}, Options) == Options(
+            verbose=True, level=2
+        )
+
+    def test_named_tuple_and_typed_dict(self) -> None:
+        class Point(NamedTuple):
+            x: float
+            y: float
+            label: Optional[str] = None
+
+        class Shape(TypedDict, total=False):
+            name: Required[str]
+            points: List[Point]
+            price: Decimal
+
+        shape = decode_str(
+            '{"name": "line", "points": [[0, 1], {"x": 2, "y": 3, "label": "end"}]}',
+            Shape,
+        )
+
+        assert shape == {"name": "line", "points": [Point(0, 1), Point(2, 3, "end")]}
+        assert encode(shape) == {
+            "name": "line",
+            "points": [[0, 1, None], [2, 3, "end"]],
+        }
+        assert decode(encode(shape), Shape) == shape
+        assert decode({"name": "a", "price": "1.5"}, Shape)["price"] == Decimal("1.5")
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode({"points": []}, Shape)
+
+        assert e.value.errors[0].message == "Missing required field: name"
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            decode([1, 2, None, 4], Point)
+
+        assert e.value.errors[0].message == "Expected at most 3 items"
+
+    def test_decode_tuples(self) -> None:
+        @dataclass
+        class Track:
+            name: Tuple[str, int]
+            path: List[Tuple[float, float]]
+            samples: Tuple[int, ...]
+            codes: Tuple[Decimal, ...]
+
+        coordinates = [[index, index / 2] for index in range(1000)]
+
+        parsed = decode(
+            {
+                "name": ["a", "1"],
+                "path": coordinates,
+                "samples": list(range(1000)),
+                "codes": ["1.5"],
+            },
+            Track,
+        )
+
+        assert parsed.name == ("a", 1)
+        assert parsed.path[3] == (3.0, 1.5) and len(parsed.path) == 1000
+        assert parsed.samples == tuple(range(1000))
+        assert parsed.codes == (Decimal("1.5"),)
+        empty: Any = Tuple[()]
+        shapes: List[Tuple[Any, Any]] = [
+            ([1, 2, 3], Tuple[int, int]),
+            ([1], Tuple[int, str]),
+        ]
+
+        assert decode([], empty) == ()
+
+        for value, type_ in shapes:
+            with pytest.raises(LocatedValidationErrorCollection) as e:
+                decode(value, type_)
+
+            assert e.value.errors[0].message.startswith("Expected 2 items")
@@ -0,0 +1,102 @@
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from json_codec.json_codec import Codec, encode
+from json_codec.json_text import encode_to_bytes, encode_to_str, iterencode
+
+
+class Status(Enum):
+    ACTIVE = "active"
+
+
+@dataclass
+class Line:
+    sku: str
+    price: Decimal
+    tags: List[str]
+
+
+@dataclass
+class Invoice:
+    id: UUID
+    status: Status
+    issued: date
+    created_at: datetime
+    lines: List[Line]
+    totals: Dict[Any, float]
+    note: Optional[bytes]
+
+
+INVOICE = Invoice(
+    id=UUID("3de39aae-af8a-4009-88f7-1ff8c652dff0"),
+    status=Status.ACTIVE,
+    issued=date(2020, 1, 1),
+    created_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+    lines=[Line('a "quoted"\nsku', Decimal("1.10"), ["x", "é"])] * 3,
+    totals={"net": 1.5, 2: float("inf"), Status.ACTIVE: 0.0},
+    note=b"hello",
+)
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(encode(value), ensure_ascii=False, separators=(",", ":"))
+
+
+class TestJsonText:
+    def test_iterencode_matches_encode(self) -> None:
+        assert "".join(iterencode(INVOICE)) == dumps(INVOICE)
+        assert "".join(iterencode([])) == "[]"
+        assert "".join(iterencode({"a": None})) == '{"a":null}'
+
+    def test_iterencode_chunks(self) -> None:
+        invoices = [INVOICE] * 20
+
+        chunks = list(iterencode(invoices, chunk_size=256))
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == dumps(invoices)
+
+    def test_iterencode_converts_once(self) -> None:
+        codec = Codec()
+        codec.register_encoder(float, lambda value: round(value, 1))
+        codec.register_encoder(str, lambda value: value.upper())
+
+        assert "".join(iterencode([1.234, "a"], codec=codec)) == '[1.2,"A"]'
+
+    def test_encode_to_str_follows_json_type_encoders(self) -> None:
+        codec = Codec()
+        codec.register_encoder(float, lambda value: round(value, 1))
+
+        assert codec.encode([1.234]) == [1.2]
+        assert encode_to_str([1.234], codec=codec) == "[1.2]"
+        assert encode_to_str([1.234]) == "[1.234]"
+
+    def test_encode_to_str_follows_json_subclass_encoders(self) -> None:
+        class Size(str, Enum):
+            SMALL = "small"
+
+        class Cents(int):
+            pass
+
+        codec = Codec()
+        codec.register_encoder(Size, lambda value: value.name)
+        codec.register_encoder(Cents, lambda value: value / 100)
+
+        assert encode_to_str([Size.SMALL, Cents(250)], codec=codec) == (
+            '["SMALL",2.5]'
+        )
+        assert encode_to_str([Size.SMALL, Cents(250)]) == '["small",250]'
+
+    def test_encode_to_str_and_bytes(self) -> None:
+        assert encode_to_str(INVOICE) == dumps(INVOICE)
+        assert encode_to_str(INVOICE.lines) == dumps(INVOICE.lines)
+        assert encode_to_bytes([INVOICE]) == dumps([INVOICE]).encode()
+        assert encode_to_str({Status.ACTIVE: date(2020, 1, 1)}) == (
+            '{"active":"2020-01-01"}'
+        )
+        assert encode_to_str(2**70) == str(2**70)
@@ -0,0 +1,77 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import pytest
+
+from json_codec.json_codec import LocatedValidationErrorCollection
+from json_codec.lazy import LazyList, LazyRecord, decode_lazy
+
+
+@dataclass
+class Header:
+    id: int
+    route: str
+
+
+@dataclass
+class Line:
+    sku: str
+    quantity: int
+
+
+@dataclass
+class Envelope:
+    header: Header
+    lines: List[Line]
+    totals: Dict[str, int]
+    tags: List[str] = field(default_factory=list)
+
+
+DOCUMENT = {
+    "header": {"id": "7", "route": "orders"},
+    "lines": [{"sku": "a", "quantity": 1}, {"sku": "b", "quantity": "many"}],
+    "totals": {"net": "oops"},
+}
+
+
+class TestLazy:
+    def test_decodes_fields_on_access(self) -> None:
+        envelope = decode_lazy(DOCUMENT, Envelope)
+
+        assert isinstance(envelope, LazyRecord)
+        assert isinstance(envelope.header, LazyRecord)
+        assert envelope.header.id == 7
+        assert envelope.header is envelope.header
+        assert envelope.tags == []
+        assert isinstance(envelope.lines, LazyList)
+        assert len(envelope.lines) == 2
+        assert [line.sku for line in envelope.lines] == ["a", "b"]
+        assert envelope.lines[-1].sku == "b"
+
+        with pytest.raises(AttributeError):
+            envelope.missing
+
+    def test_errors_on_access_and_validate(self) -> None:
+        envelope: Any = decode_lazy(DOCUMENT, Envelope)
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            envelope.lines[1].quantity
+
+        assert e.value.errors[0].json_path == "$.lines[1].quantity"
+
+        with pytest.raises(LocatedValidationErrorCollection) as e:
+            envelope.validate()
+
+        assert [error.json_path for error in e.value.errors] == [
+            "$.lines[1].quantity",
+            "$.totals['net'] (value)",
+        ]
+
+    def test_validate_returns_decoded_value(self) -> None:
+        document = {**DOCUMENT, "lines": [], "totals": {"net": 1}}
+
+        envelope: Any = decode_lazy(document, Envelope)
+
+        assert envelope.validate() == Envelope(Header(7, "orders"), [], {"net": 1})
+        assert envelope.totals == {"net": 1}
+        assert decode_lazy([document], List[Envelope])[0].header.route == "orders"
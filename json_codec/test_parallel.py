@@ -0,0 +1,53 @@
+import json
+from dataclasses import dataclass
+from typing import List
+
+import pytest
+
+from json_codec.json_codec import LocatedValidationErrorCollection
+from json_codec.parallel import BatchValidationError, decode_many
+
+
+@dataclass
+class Event:
+    id: int
+    tags: List[str]
+
+
+DOCUMENTS = [json.dumps({"id": index, "tags": ["a"]}) for index in range(40)]
+
+
+class TestDecodeMany:
+    def test_decode_many_in_order(self) -> None:
+        expected = [Event(index, ["a"]) for index in range(40)]
+
+        assert decode_many(DOCUMENTS, Event, workers=2, chunksize=7) == expected
+        assert decode_many(DOCUMENTS, Event, workers=1) == expected
+
+    def test_decode_many_reports_errors_per_item(self) -> None:
+        documents = DOCUMENTS[:3] + ['{"id": "x", "tags": []}', '{"tags": []}']
+
+        with pytest.raises(BatchValidationError) as e:
+            decode_many(documents, Event, workers=2, chunksize=2)
+
+        assert sorted(e.value.errors) == [3, 4]
+        assert isinstance(e.value.errors[3], LocatedValidationErrorCollection)
+        assert e.value.errors[3].errors[0].json_path == "$.id"
+
+        results = decode_many(
+            documents, Event, workers=2, chunksize=2, return_exceptions=True
+        )
+
+        assert results[:3] == [Event(index, ["a"]) for index in range(3)]
+        assert isinstance(results[4], LocatedValidationErrorCollection)
+
+    def test_decode_many_reports_malformed_documents_per_item(self) -> None:
+        documents = DOCUMENTS[:3] + ['{"id": 1, "tags": [', '{"id": null, "tags": []}']
+
+        results = decode_many(
+            documents, Event, workers=2, chunksize=2, return_exceptions=True
+        )
+
+        assert results[:3] == [Event(index, ["a"]) for index in range(3)]
+        assert isinstance(results[3], ValueError)
+        assert isinstance(results[4], TypeError)
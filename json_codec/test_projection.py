@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from json_codec.json_codec import decode, decode_str
+from json_codec.projection import SKIPPED, Projection
+
+
+@dataclass
+class Customer:
+    email: str
+    name: str
+
+
+@dataclass
+class Item:
+    sku: str
+    quantity: int
+
+
+@dataclass
+class Order:
+    id: int
+    customer: Customer
+    items: List[Item]
+    notes: List[str] = field(default_factory=list)
+    channel: str = "web"
+
+
+DOCUMENT = {
+    "id": 7,
+    "customer": {"email": "a@example.com", "name": 42},
+    "items": [{"sku": "a", "quantity": "many"}, {"sku": "b", "quantity": 2}],
+    "notes": {"not": "a list"},
+    "channel": "shop",
+}
+
+
+class TestProjection:
+    def test_decodes_only_included_paths(self) -> None:
+        order = decode(
+            DOCUMENT, Order, include={"id", "customer.email", "items[*].sku"}
+        )
+
+        assert order == Order(
+            id=7,
+            customer=Customer(email="a@example.com", name=SKIPPED),
+            items=[
+                Item(sku="a", quantity=SKIPPED),
+                Item(sku="b", quantity=SKIPPED),
+            ],
+            notes=[],
+            channel="web",
+        )
+
+    def test_included_name_takes_whole_subtree(self) -> None:
+        document = dict(DOCUMENT, items=[{"sku": "a", "quantity": 1}])
+        order = decode(document, Order, include=Projection(["id", "items"]))
+
+        assert order.customer is SKIPPED
+        assert order.items == [Item("a", 1)]
+
+    def test_applies_to_items_of_containers(self) -> None:
+        orders = decode([DOCUMENT], List[Order], include={"[*].id"})
+        by_name = decode({"x": DOCUMENT}, Dict[str, Order], include={"id"})
+        optional_order: Any = Optional[Order]
+        optional = decode_str('{"id": 1}', optional_order, include={"id"})
+
+        assert orders[0].id == 7 and orders[0].customer is SKIPPED
+        assert by_name["x"].id == 7 and by_name["x"].items is SKIPPED
+        assert optional is not None and optional.id == 1
+
+    def test_projection_equality(self) -> None:
+        projection = Projection(["items[*].sku", "customer.email", "customer"])
+
+        assert projection == Projection(["customer", "items[*].sku"])
+        assert hash(projection) == hash(Projection(["customer", "items[*].sku"]))
+        assert repr(projection) == "Projection(['customer', 'items[*].sku'])"
+
+    def test_rejects_invalid_paths(self) -> None:
+        for path in ["items[0]", "a..b", ".a", "a.", "items[*]x", ""]:
+            with pytest.raises(ValueError):
+                Projection([path])
+
+    def test_rejects_unknown_fields(self) -> None:
+        optional_customer: Any = Optional[Customer]
+
+        with pytest.raises(ValueError, match="customr"):
+            decode(DOCUMENT, Order, include={"id", "customr.email"})
+        with pytest.raises(ValueError, match="emial"):
+            decode(DOCUMENT, Order, include={"customer.emial"})
+        with pytest.raises(ValueError, match="nmae"):
+            decode(None, optional_customer, include={"nmae"})
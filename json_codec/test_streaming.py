@@ -0,0 +1,76 @@
+import gzip
+import io
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import List
+
+import pytest
+
+from json_codec.json_codec import LocatedValidationErrorCollection, encode
+from json_codec.streaming import iter_decode, write_ndjson
+
+
+@dataclass
+class Record:
+    id: int
+    name: str
+    amount: Decimal
+
+
+RECORDS = [Record(index, "record-%d" % index, Decimal("1.10")) for index in range(50)]
+
+
+class TestStreaming:
+    def test_iter_decode_array(self) -> None:
+        text = json.dumps([encode(record) for record in RECORDS], indent=2)
+
+        assert list(iter_decode(io.StringIO(text), Record, chunk_size=7)) == RECORDS
+        assert (
+            list(iter_decode(io.BytesIO(text.encode()), Record, chunk_size=7))
+            == RECORDS
+        )
+        numbers = io.StringIO(" [ 1 , 22 ,333] ")
+
+        assert list(iter_decode(numbers, int, chunk_size=1)) == [1, 22, 333]
+        assert list(iter_decode(io.StringIO("[]"), int)) == []
+
+    def test_iter_decode_invalid_array(self) -> None:
+        with pytest.raises(ValueError):
+            list(iter_decode(io.StringIO("[1, 2"), int))
+
+        with pytest.raises(ValueError):
+            list(iter_decode(io.StringIO("[1 2]"), int))
+
+        with pytest.raises(LocatedValidationErrorCollection):
+            list(iter_decode(io.StringIO('[{"id": 1}]'), Record))
+
+    def test_write_and_iter_ndjson(self) -> None:
+        buffer = io.BytesIO()
+
+        assert write_ndjson(buffer, RECORDS, batch_size=8) == len(RECORDS)
+        assert buffer.getvalue().count(b"\n") == len(RECORDS)
+        assert list(iter_decode(io.BytesIO(buffer.getvalue()), Record)) == RECORDS
+
+        text = io.StringIO()
+        write_ndjson(text, [[1, 2], [3]])
+
+        assert text.getvalue() == "[1,2]\n[3]\n"
+        assert list(
+            iter_decode(io.StringIO(text.getvalue()), List[int], format="ndjson")
+        ) == [[1, 2], [3]]
+
+    def test_write_ndjson_values_json_allows(self) -> None:
+        text = io.StringIO()
+
+        write_ndjson(text, [{1: "a"}, 2**70, float("nan")])
+
+        assert text.getvalue() == '{"1":"a"}\n%d\nNaN\n' % 2**70
+
+    def test_write_ndjson_compressed(self) -> None:
+        buffer = io.BytesIO()
+
+        write_ndjson(buffer, RECORDS, compress=True)
+        buffer.seek(0)
+
+        assert list(iter_decode(gzip.GzipFile(fileobj=buffer), Record)) == RECORDS
@@ -53,6 +53,22 @@ class TypeArgsLengthMismatch(ValidationError):
     pass
 
 
+class InvalidEnumValue(ValidationError):
+    def __init__(self, enum_type: Any, value: Any) -> None:
+        super().__init__(enum_type, value)
+        self.enum_type = enum_type
+        self.value = value
+
+    def __str__(self) -> str:
+        # only rendered when the error is reported, union members that fail
+        # while being tried never pay for it
+        return "Invalid enum value for {}: {} | valid types: {}".format(
+            self.enum_type,
+            self.value,
+            ", ".join(k for k, v in self.enum_type.__members__.items()),
+        )
+
+
 class ValidationErrorCollection(ValidationErrorBase):
     def __init__(self, errors: List[ValidationErrorBase]) -> None:
         self.errors = errors
@@ -73,6 +89,19 @@ def flat_error_collection(
     return flat_errors
 
 
+# a step of a JSON path: a raw string such as ".field", a list index or a
+# (key, "key" | "value") pair for dict entries
+JsonPathSegment = Union[str, int, Tuple[Any, str]]
+
+
+def format_json_path_segment(segment: JsonPathSegment) -> str:
+    if isinstance(segment, int):
+        return "[{}]".format(segment)
+    if isinstance(segment, tuple):
+        return "['{}'] ({})".format(*segment)
+    return segment
+
+
 @dataclass
 class ParseProcessResult(Generic[T]):
     result: Union[ValidationErrorBase, T]
@@ -82,7 +111,7 @@ class ParseProcessResult(Generic[T]):
 class ParseProcessYield(Generic[T]):
     value: T
     type_: Type[T]
-    json_path: str
+    json_path: JsonPathSegment
     skip_raise: bool = False
 
 
@@ -96,7 +125,21 @@ class TypeDecoder(Generic[T], ABC):
         raise NotImplementedError()
 
     def _success(self, value: T) -> ParseProcessResult[T]:
-        return ParseProcessResult[T](result=value)
+        return ParseProcessResult(result=value)
 
     def _failure(self, error: ValidationErrorBase) -> ParseProcessResult[T]:
-        return ParseProcessResult[T](result=error)
+        return ParseProcessResult(result=error)
+
+
+class LeafTypeDecoder(TypeDecoder[T]):
+    @abstractmethod
+    def decode(self, value: Any) -> Union[ValidationErrorBase, T]:
+        raise NotImplementedError()
+
+    def parse(
+        self, value: Any, *types: Type[Any]
+    ) -> Generator[
+        ParseProcessYield[Any], ParseProcessResult[Any], ParseProcessResult[T]
+    ]:
+        return ParseProcessResult(result=self.decode(value))
+        yield